@@ -4,16 +4,20 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from flask_migrate import Migrate
 from dotenv import load_dotenv
+from .db_routing import RoutingSession
 
 # Load environment variables from .env file
 load_dotenv()
 
 # Initialize extensions
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession}) # Sends @read_only views to replicas
 login_manager = LoginManager()
 migrate = Migrate()
 
-def create_app():
+def _int_or_none(value):
+    return int(value) if value else None
+
+def create_app(test_config=None):
     app = Flask(__name__, instance_relative_config=True) # instance_relative_config=True allows for instance folder config
 
     # Configuration
@@ -21,8 +25,35 @@ def create_app():
         SECRET_KEY=os.environ.get('SECRET_KEY', 'dev_secret_key'), # Default for dev, override in production
         SQLALCHEMY_DATABASE_URI=os.environ.get('DATABASE_URL', f"sqlite:///{os.path.join(app.instance_path, 'site.db')}"),
         SQLALCHEMY_TRACK_MODIFICATIONS=False,
+        TICKETS_PER_PAGE=int(os.environ.get('TICKETS_PER_PAGE', 25)),
+        COMMENTS_PER_PAGE=int(os.environ.get('COMMENTS_PER_PAGE', 50)), # Comments rendered with a ticket; the rest load on demand
+        CHOICES_CACHE_TTL=int(os.environ.get('CHOICES_CACHE_TTL', 300)), # Seconds; bounds staleness across workers
+        CHOICES_INLINE_LIMIT=int(os.environ.get('CHOICES_INLINE_LIMIT', 200)), # Longer dropdowns become type-ahead boxes
+        USER_CACHE_SIZE=int(os.environ.get('USER_CACHE_SIZE', 1024)), # user_loader identity cache; 0 disables
+        USER_CACHE_TTL=int(os.environ.get('USER_CACHE_TTL', 60)),
+        SLOW_QUERY_THRESHOLD_MS=float(os.environ['SLOW_QUERY_THRESHOLD_MS']) if os.environ.get('SLOW_QUERY_THRESHOLD_MS') else None, # Unset disables the slow-query log
+        SLOW_QUERY_LOG=os.environ.get('SLOW_QUERY_LOG'), # Defaults to instance/slow_queries.jsonl
+        METRICS_ENABLED=os.environ.get('METRICS_ENABLED', '').lower() in ('1', 'true', 'yes'), # Serve /metrics
+        READ_REPLICA_URIS=[uri.strip() for uri in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if uri.strip()],
+        READ_YOUR_WRITES_SECONDS=int(os.environ.get('READ_YOUR_WRITES_SECONDS', 5)), # Primary-only reads after a user's write
+        # Live ticket updates over SSE, see app/tickets/live.py; LIVE_EVENTS_DB=None keeps events in-process
+        LIVE_EVENTS_DB=os.environ.get('LIVE_EVENTS_DB', os.path.join(app.instance_path, 'events.db')),
+        LIVE_QUEUE_SIZE=int(os.environ.get('LIVE_QUEUE_SIZE', 100)), # Per open stream; oldest events dropped beyond this
+        LIVE_POLL_INTERVAL=float(os.environ.get('LIVE_POLL_INTERVAL', 0.5)), # Seconds between bus polls
+        LIVE_HEARTBEAT_SECONDS=int(os.environ.get('LIVE_HEARTBEAT_SECONDS', 15)),
+        # Engine tuning, see app/engine_profile.py
+        DB_ENGINE_PROFILE=os.environ.get('DB_ENGINE_PROFILE', 'tuned'), # 'tuned' (WAL, busy_timeout, ...) or 'stock'
+        SQLITE_PRAGMAS=os.environ.get('SQLITE_PRAGMAS'), # Overrides, e.g. "busy_timeout=10000,mmap_size=0"
+        DB_POOL_SIZE=_int_or_none(os.environ.get('DB_POOL_SIZE')), # Pool settings apply to server databases only
+        DB_MAX_OVERFLOW=_int_or_none(os.environ.get('DB_MAX_OVERFLOW')),
+        DB_POOL_TIMEOUT=_int_or_none(os.environ.get('DB_POOL_TIMEOUT')),
+        DB_POOL_RECYCLE=int(os.environ.get('DB_POOL_RECYCLE', 1800)), # Seconds; below the server's idle timeout
+        DB_POOL_PRE_PING=os.environ.get('DB_POOL_PRE_PING', '1').lower() in ('1', 'true', 'yes'),
     )
 
+    if test_config is not None:
+        app.config.from_mapping(test_config)
+
     # Ensure the instance folder exists
     try:
         os.makedirs(app.instance_path)
@@ -30,10 +61,23 @@ def create_app():
         pass # Already exists
 
     # Initialize extensions with app
+    from . import engine_profile, db_routing
+    engine_profile.configure(app)
+    db_routing.configure(app)
     db.init_app(app)
+    engine_profile.init_app(app)
+    db_routing.init_app(app)
     login_manager.init_app(app)
     migrate.init_app(app, db) # Models need to be imported before migrate commands are run
 
+    # Per-request SQL statement counting, used by @query_budget on the busiest endpoints
+    from . import query_counter
+    query_counter.init_app(app)
+
+    # Statements over SLOW_QUERY_THRESHOLD_MS are logged with their query plan; see `flask db advise-indexes`
+    from . import slow_queries
+    slow_queries.init_app(app)
+
     # Login manager configuration
     login_manager.login_view = 'auth.login' # Blueprint 'auth', route 'login'
     login_manager.login_message_category = 'info'
@@ -43,6 +87,10 @@ def create_app():
     # Import models here or ensure they are imported by blueprints
     # This ensures Flask-Migrate can see them
     from . import models
+    models.init_user_cache(app)
+
+    from . import choices
+    choices.init_app(app)
 
     # Import and register blueprints
     from .main import bp as main_bp
@@ -57,6 +105,13 @@ def create_app():
     from .inventory import bp as inventory_bp
     app.register_blueprint(inventory_bp, url_prefix='/inventory')
 
+    # Request latency/SQL/template timings for Prometheus, only collected when METRICS_ENABLED
+    from . import metrics
+    metrics.init_app(app)
+
+    from .bench import cli as bench_cli
+    app.cli.add_command(bench_cli)
+
     @app.route('/health')
     def health_check():
         return "OK", 200
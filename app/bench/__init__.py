@@ -0,0 +1,6 @@
+from flask.cli import AppGroup
+
+# 'flask bench ...': synthetic data and a repeatable benchmark of the main pages
+cli = AppGroup('bench', help="Generate benchmark data and measure page performance.")
+
+from . import commands
@@ -0,0 +1,57 @@
+import click
+from flask import current_app
+from . import cli
+from .seed import BENCH_PASSWORD, seed
+from .runner import compare, load_baseline, run_benchmarks, save_baseline
+
+
+@cli.command('seed')
+@click.option('--users', default=500, show_default=True, help="Employees to create.")
+@click.option('--staff', default=20, show_default=True, help="IT support users to create.")
+@click.option('--equipment', default=1000, show_default=True)
+@click.option('--tickets', default=20000, show_default=True)
+@click.option('--comments-per-ticket', default=3.0, show_default=True, help="Mean comments on an ordinary ticket.")
+@click.option('--long-thread-ratio', default=0.01, show_default=True, help="Share of tickets with a long thread.")
+@click.option('--long-thread-length', default=500, show_default=True, help="Comments on each long thread.")
+@click.option('--reporter-skew', default=1.1, show_default=True,
+              help="Zipf exponent for picking reporters; 0 spreads tickets evenly.")
+@click.option('--days', default=365, show_default=True, help="Spread tickets over this many past days.")
+@click.option('--seed', 'random_seed', default=0, show_default=True, help="Random seed, for repeatable datasets.")
+@click.option('--batch-size', default=1000, show_default=True)
+def seed_command(**options):
+    """Insert a synthetic dataset into the configured database."""
+    click.echo(f"Seeding {current_app.config['SQLALCHEMY_DATABASE_URI']} ...")
+    stats = seed(**options)
+    click.echo(f"Created {stats.users} users, {stats.equipment} equipment, {stats.tickets} tickets "
+               f"and {stats.comments} comments. Password for every bench user: {BENCH_PASSWORD}")
+
+
+@cli.command('run')
+@click.option('--requests', default=50, show_default=True, help="Measured requests per scenario.")
+@click.option('--warmup', default=3, show_default=True, help="Unmeasured requests per scenario.")
+@click.option('--save', 'save_path', type=click.Path(dir_okay=False), help="Write the results as a baseline.")
+@click.option('--baseline', 'baseline_path', type=click.Path(exists=True, dir_okay=False),
+              help="Compare against a saved baseline; exits non-zero on regressions.")
+@click.option('--tolerance', default=0.2, show_default=True, help="Allowed latency/memory growth over the baseline.")
+def run_command(requests, warmup, save_path, baseline_path, tolerance):
+    """Benchmark the main pages and report latency, queries and peak memory."""
+    results = run_benchmarks(current_app._get_current_object(), requests=requests, warmup=warmup)
+    if not results:
+        raise click.ClickException("Nothing to benchmark; run 'flask bench seed' first.")
+
+    click.echo(f"{'scenario':<28} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'queries':>8} {'peak KiB':>9}")
+    for name, r in results.items():
+        flag = '' if r['status'] == 200 else f"  (HTTP {r['status']})"
+        click.echo(f"{name:<28} {r['p50_ms']:>8.2f} {r['p90_ms']:>8.2f} {r['p99_ms']:>8.2f} "
+                   f"{r['queries']:>8g} {r['peak_kib']:>9.1f}{flag}")
+
+    if save_path:
+        save_baseline(save_path, results)
+        click.echo(f"Baseline saved to {save_path}")
+    if baseline_path:
+        regressions = compare(results, load_baseline(baseline_path), tolerance)
+        for name, metric, before, after in regressions:
+            click.echo(f"REGRESSION {name} {metric}: {before} -> {after}", err=True)
+        if regressions:
+            raise SystemExit(1)
+        click.echo("No regressions against the baseline.")
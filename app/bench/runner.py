@@ -0,0 +1,150 @@
+import json
+import statistics
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from flask import url_for
+from app import db
+from app.models import User, Ticket, Comment, Equipment
+from app.query_counter import QueryCounter
+
+# Benchmark runner. Drives the busiest pages through the test client as a real
+# employee and a real IT support user from the database (run `flask bench seed`
+# first), and reports latency percentiles, SQL statements per request and peak
+# Python memory per scenario. Results can be saved as a JSON baseline and later
+# runs compared against it.
+
+PERCENTILES = (50, 90, 99)
+
+
+class Scenario:
+    def __init__(self, name, role, endpoint, **values):
+        self.name = name
+        self.role = role # 'employee' or 'staff'
+        self.endpoint = endpoint
+        self.values = values
+
+
+def _busiest_reporter():
+    return db.session.execute(db.select(Ticket.reporter_id).group_by(Ticket.reporter_id)
+                              .order_by(db.func.count().desc()).limit(1)).scalar()
+
+
+def _longest_thread():
+    return db.session.execute(db.select(Comment.ticket_id).group_by(Comment.ticket_id)
+                              .order_by(db.func.count().desc()).limit(1)).scalar()
+
+
+def default_scenarios():
+    """Scenarios over the current data, or an empty list when there is nothing to benchmark."""
+    latest_ticket = db.session.scalar(db.select(db.func.max(Ticket.id)))
+    equipment_id = db.session.scalar(db.select(db.func.max(Equipment.id)))
+    if latest_ticket is None:
+        return []
+    scenarios = [
+        Scenario('index', 'employee', 'main.index'),
+        Scenario('list_tickets/employee', 'employee', 'tickets.list_tickets'),
+        Scenario('list_tickets/staff', 'staff', 'tickets.list_tickets'),
+        Scenario('list_tickets/staff/open', 'staff', 'tickets.list_tickets', status='Open'),
+        Scenario('view_ticket', 'staff', 'tickets.view_ticket', ticket_id=latest_ticket),
+        Scenario('view_ticket/long_thread', 'staff', 'tickets.view_ticket', ticket_id=_longest_thread() or latest_ticket),
+        Scenario('search', 'staff', 'tickets.search', q='printer'),
+    ]
+    if equipment_id is not None:
+        scenarios += [
+            Scenario('list_equipment', 'staff', 'inventory.list_equipment'),
+            Scenario('view_equipment', 'staff', 'inventory.view_equipment', equipment_id=equipment_id),
+        ]
+    return scenarios
+
+
+def _percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _client_for(app, user_id):
+    client = app.test_client()
+    with client.session_transaction() as session: # Log in without a password or CSRF token
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+    return client
+
+
+def _measure(app, client, url, requests, warmup):
+    for _ in range(warmup):
+        client.get(url)
+    timings, queries = [], []
+    status = None
+    for _ in range(requests):
+        with app.app_context(), QueryCounter() as counter:
+            start = time.perf_counter()
+            response = client.get(url)
+            response.get_data()
+            timings.append((time.perf_counter() - start) * 1000)
+        queries.append(counter.count)
+        status = response.status_code
+
+    tracemalloc.start() # Separate pass; tracing slows every allocation down
+    client.get(url).get_data()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings.sort()
+    result = {f'p{pct}_ms': round(_percentile(timings, pct), 3) for pct in PERCENTILES}
+    result.update(mean_ms=round(statistics.fmean(timings), 3), queries=statistics.median(queries),
+                  peak_kib=round(peak / 1024, 1), status=status, requests=requests)
+    return result
+
+
+def run_benchmarks(app, scenarios=None, requests=50, warmup=3):
+    """{scenario name: measurements}. Requests run on a worker thread so each gets its own app context."""
+    with app.app_context():
+        if scenarios is None:
+            scenarios = default_scenarios()
+        users = {
+            'employee': _busiest_reporter(),
+            'staff': db.session.scalar(db.select(User.id).where(User.role.in_(['it_support', 'admin']))
+                                       .order_by(User.id).limit(1)),
+        }
+        with app.test_request_context():
+            urls = {s.name: url_for(s.endpoint, **s.values) for s in scenarios}
+
+    def run():
+        results = {}
+        clients = {role: _client_for(app, user_id) for role, user_id in users.items() if user_id is not None}
+        for scenario in scenarios:
+            if scenario.role in clients:
+                results[scenario.name] = _measure(app, clients[scenario.role], urls[scenario.name], requests, warmup)
+        return results
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(run).result()
+
+
+def save_baseline(path, results):
+    with open(path, 'w') as f:
+        json.dump({'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': results}, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def compare(results, baseline, tolerance=0.2):
+    """
+    Regressions against a baseline, as (scenario, metric, baseline value, new value).
+    Latency may grow by `tolerance` (a fraction) before it counts; any extra query counts.
+    """
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        for metric in ('p50_ms', 'p90_ms', 'peak_kib'): # p99 of a few dozen requests is mostly noise
+            if result[metric] > before[metric] * (1 + tolerance):
+                regressions.append((name, metric, before[metric], result[metric]))
+        if result['queries'] > before['queries']:
+            regressions.append((name, 'queries', before['queries'], result['queries']))
+    return regressions
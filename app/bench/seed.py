@@ -0,0 +1,124 @@
+import random
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+from app import db, choices
+from app.models import User, Ticket, Comment, Equipment
+from app.tickets.forms import STATUS_CHOICES, PRIORITY_CHOICES
+
+# Synthetic dataset for benchmarks. Volumes and skew are configurable:
+#   - reporters are drawn from a Zipf-like distribution, so a few "hot" employees
+#     report most tickets (reporter_skew=0 makes everyone equally likely);
+#   - most tickets get a handful of comments, but long_thread_ratio of them become
+#     incident threads with long_thread_length comments.
+# All generated users share the password BENCH_PASSWORD.
+
+BENCH_PASSWORD = 'benchmark'
+
+_TITLES = ["Printer not working", "Cannot connect to VPN", "Laptop battery drains fast", "Email not syncing",
+           "Monitor flickering", "Password reset request", "Software install request", "Keyboard keys stuck",
+           "Slow network on floor 3", "Outlook crashes on start", "Docking station not detected"]
+_WORDS = ("the issue started after the update and happens every morning when I log in "
+          "please advise restarted already same error message screen shows blank").split()
+_EQUIPMENT = [('Laptop', 'ThinkPad'), ('Desktop', 'OptiPlex'), ('Monitor', 'UltraSharp'),
+              ('Keyboard', 'K120'), ('Mouse', 'M90'), ('Printer', 'LaserJet')]
+
+
+class SeedStats:
+    def __init__(self):
+        self.users = 0
+        self.equipment = 0
+        self.tickets = 0
+        self.comments = 0
+
+
+def _sentence(rng, words=12):
+    return ' '.join(rng.choice(_WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def _insert(model, rows, batch_size, returning=False):
+    stmt = insert(model).execution_options(render_nulls=True)
+    ids = []
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        if returning:
+            ids += db.session.scalars(stmt.returning(model.id, sort_by_parameter_order=True), batch).all()
+        else:
+            db.session.execute(stmt, batch)
+    return ids
+
+
+def seed(users=500, staff=20, equipment=1000, tickets=20000, comments_per_ticket=3,
+         long_thread_ratio=0.01, long_thread_length=500, reporter_skew=1.1,
+         days=365, batch_size=1000, random_seed=0):
+    """Insert a synthetic dataset alongside whatever is already in the database."""
+    rng = random.Random(random_seed)
+    stats = SeedStats()
+    now = datetime.now(timezone.utc)
+    # Offset so repeated seeding never collides on username/email/serial
+    run = db.session.scalar(db.select(db.func.count()).select_from(User))
+
+    password_hash = generate_password_hash(BENCH_PASSWORD) # Hashing per user would dominate seeding time
+    user_rows = [{'username': f"bench{run + i}", 'email': f"bench{run + i}@example.com",
+                  'password_hash': password_hash, 'role': 'employee', 'created_at': now}
+                 for i in range(users)]
+    user_rows += [{'username': f"bench{run + users + i}", 'email': f"bench{run + users + i}@example.com",
+                   'password_hash': password_hash, 'role': 'it_support', 'created_at': now}
+                  for i in range(staff)]
+    user_ids = _insert(User, user_rows, batch_size, returning=True)
+    employee_ids, staff_ids = user_ids[:users], user_ids[users:] or user_ids
+    stats.users = len(user_ids)
+
+    equipment_rows = []
+    for i in range(equipment):
+        kind, model = rng.choice(_EQUIPMENT)
+        owner = rng.choice(employee_ids) if employee_ids and rng.random() < 0.6 else None
+        equipment_rows.append({'name': f"{kind} {run}-{i}", 'type': kind, 'serial_number': f"BENCH-{run}-{i}",
+                               'manufacturer': 'Bench', 'model_number': model,
+                               'status': 'Assigned' if owner else 'In Stock', 'assigned_to_user_id': owner,
+                               'notes': None, 'purchase_date': None, 'warranty_expiry_date': None})
+    equipment_ids = _insert(Equipment, equipment_rows, batch_size, returning=True)
+    stats.equipment = len(equipment_ids)
+
+    reporter_weights = list(accumulate(1 / (rank + 1) ** reporter_skew for rank in range(len(employee_ids))))
+    statuses = [value for value, _ in STATUS_CHOICES]
+    priorities = [value for value, _ in PRIORITY_CHOICES]
+    start = now - timedelta(days=days)
+
+    ticket_rows, thread_lengths = [], []
+    for i in range(tickets):
+        created_at = start + timedelta(seconds=days * 86400 * i / max(tickets, 1))
+        if rng.random() < long_thread_ratio:
+            length = long_thread_length
+        else:
+            length = int(rng.expovariate(1 / comments_per_ticket)) if comments_per_ticket else 0
+        status = rng.choice(statuses)
+        ticket_rows.append({
+            'title': rng.choice(_TITLES), 'description': _sentence(rng, 30),
+            'status': status, 'priority': rng.choice(priorities),
+            'reporter_id': rng.choices(employee_ids, cum_weights=reporter_weights)[0] if employee_ids else user_ids[0],
+            'assignee_id': rng.choice(staff_ids) if rng.random() < 0.7 else None,
+            'equipment_id': rng.choice(equipment_ids) if equipment_ids and rng.random() < 0.4 else None,
+            'created_at': created_at, 'updated_at': created_at + timedelta(minutes=10 * length),
+            'resolved_at': created_at + timedelta(hours=rng.randint(1, 96)) if status in ('Resolved', 'Closed') else None,
+        })
+        thread_lengths.append(length)
+
+    for offset in range(0, len(ticket_rows), batch_size):
+        batch = ticket_rows[offset:offset + batch_size]
+        ticket_ids = _insert(Ticket, batch, batch_size, returning=True)
+        comment_rows = []
+        for ticket_id, ticket, length in zip(ticket_ids, batch, thread_lengths[offset:offset + batch_size]):
+            participants = [ticket['reporter_id'], ticket['assignee_id'] or rng.choice(staff_ids)]
+            for n in range(length):
+                comment_rows.append({'ticket_id': ticket_id, 'user_id': participants[n % 2], 'body': _sentence(rng),
+                                     'created_at': ticket['created_at'] + timedelta(minutes=10 * (n + 1))})
+        _insert(Comment, comment_rows, batch_size)
+        db.session.commit() # One transaction per batch keeps the write lock short
+        stats.tickets += len(ticket_ids)
+        stats.comments += len(comment_rows)
+
+    db.session.commit()
+    choices.invalidate('user', 'equipment') # Bulk INSERTs bypass the mapper events
+    return stats
@@ -0,0 +1,126 @@
+import threading
+from flask import current_app, url_for
+from markupsafe import Markup
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from wtforms.widgets import Select, html_params
+from app import db
+from app.cache import LRUCache
+from app.models import User, Equipment
+
+# Dropdown choice lists shared by TicketForm, UpdateTicketForm and AssignEquipmentForm.
+#
+# Each list is cached under a key containing the version of every table it is built
+# from. Inserts/updates/deletes on User or Equipment bump that version once the
+# transaction commits, so the next form simply misses and rebuilds. Versions are
+# per process; CHOICES_CACHE_TTL bounds how long another worker's writes can go unseen.
+_versions = {'user': 0, 'equipment': 0}
+_versions_lock = threading.Lock()
+_cache = LRUCache(maxsize=32, ttl=300)
+
+
+def init_app(app):
+    _cache.ttl = app.config['CHOICES_CACHE_TTL']
+    _cache.clear()
+
+
+def version(name):
+    return _versions[name]
+
+
+def invalidate(*names):
+    with _versions_lock:
+        for name in names:
+            _versions[name] += 1
+
+
+def cache_stats():
+    return _cache.stats()
+
+
+def _cached(name, depends_on, loader):
+    key = (name,) + tuple(_versions[table] for table in depends_on)
+    return _cache.get_or_set(key, loader)
+
+
+def equipment_choices():
+    """(id, label) for every non-retired piece of equipment, by name."""
+    return _cached('equipment', ['equipment'], lambda: [
+        (e.id, f"{e.name} (S/N: {e.serial_number or 'N/A'})")
+        for e in db.session.execute(
+            db.select(Equipment.id, Equipment.name, Equipment.serial_number)
+            .filter(Equipment.status != 'Retired').order_by(Equipment.name))
+    ])
+
+
+def assignee_choices():
+    """(id, username) for every user who can be assigned tickets."""
+    return _cached('assignees', ['user'], lambda: [
+        (u.id, u.username)
+        for u in db.session.execute(
+            db.select(User.id, User.username)
+            .filter(User.role.in_(['it_support', 'admin'])).order_by(User.username))
+    ])
+
+
+def user_choices():
+    """(id, 'username (email)') for every user."""
+    return _cached('users', ['user'], lambda: [
+        (u.id, f"{u.username} ({u.email})")
+        for u in db.session.execute(
+            db.select(User.id, User.username, User.email).order_by(User.username))
+    ])
+
+
+def _mark_changed(name):
+    def listener(mapper, connection, target):
+        session = object_session(target)
+        if session is not None:
+            session.info.setdefault('changed_choice_tables', set()).add(name)
+    return listener
+
+
+for _model, _name in ((User, 'user'), (Equipment, 'equipment')):
+    for _event_name in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(_model, _event_name, _mark_changed(_name))
+
+
+# Bumping on commit rather than flush keeps another request from caching a list
+# built before this transaction's changes became visible.
+@event.listens_for(Session, 'after_commit')
+def _invalidate_on_commit(session):
+    changed = session.info.pop('changed_choice_tables', None)
+    if changed:
+        invalidate(*changed)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_on_rollback(session):
+    session.info.pop('changed_choice_tables', None)
+
+
+class LookupSelect(Select):
+    """
+    Select widget that degrades to a type-ahead box once a choice list grows past
+    CHOICES_INLINE_LIMIT entries, so a page with thousands of users or devices does
+    not ship them all as <option>s. The text box queries `lookup_endpoint`
+    (see static/js/lookup.js) and writes the chosen id into a hidden input.
+    """
+    def __init__(self, lookup_endpoint):
+        super().__init__()
+        self.lookup_endpoint = lookup_endpoint
+
+    def __call__(self, field, **kwargs):
+        choices = field.choices or []
+        if len(choices) <= current_app.config['CHOICES_INLINE_LIMIT']:
+            return super().__call__(field, **kwargs)
+
+        selected = dict(choices).get(field.data)
+        if selected is None: # Fall back to the "none" entry, e.g. '--- Unassign ---'
+            field.data, selected = choices[0]
+        hidden = html_params(type='hidden', id=field.id, name=field.name, value=field.data)
+        text = html_params(type='text', id=f'{field.id}-lookup', value='' if field.data == choices[0][0] else selected,
+                           placeholder=choices[0][1], autocomplete='off',
+                           data_lookup_url=url_for(self.lookup_endpoint),
+                           data_lookup_target=field.id, data_lookup_empty=choices[0][0], **kwargs)
+        return Markup(f'<input {hidden}><input {text}>')
@@ -0,0 +1,63 @@
+import hashlib
+import time
+from datetime import timezone
+from functools import wraps
+from flask import current_app, make_response, request, session
+from flask_login import current_user
+from app import choices
+
+
+def _csrf_bucket():
+    # Cached pages embed a CSRF token; rotate the ETag at half the token lifetime so a
+    # page revalidated with a 304 never carries an expired token.
+    if not current_app.config.get('WTF_CSRF_ENABLED', True):
+        return None
+    limit = current_app.config.get('WTF_CSRF_TIME_LIMIT', 3600)
+    return int(time.time() // (limit / 2)) if limit else None
+
+
+def page_etag(last_modified):
+    """ETag for a detail page: the row's updated_at plus everything else the page varies on."""
+    key = [last_modified.isoformat() if last_modified else '', current_user.get_id(), current_user.role,
+           choices.version('user'), choices.version('equipment'), _csrf_bucket()]
+    return hashlib.sha1('|'.join(map(str, key)).encode('utf-8')).hexdigest()
+
+
+def conditional_get(validator):
+    """
+    Decorator answering repeat GETs of an unchanged page with 304 Not Modified.
+
+    :param validator: Called with the view's arguments. Returns the page's last
+                      modification time, from one cheap (indexed) query, or None to
+                      always run the view, e.g. when the row is missing or not visible
+                      to the current user. Apply below @login_required.
+
+    Last-Modified is sent as well, but the 304 decision uses the ETag only, because
+    the page also depends on who is viewing it.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if session.get('_flashes'): # Pending flash messages have to be rendered
+                return f(*args, **kwargs)
+            last_modified = validator(**kwargs)
+            if last_modified is None:
+                return f(*args, **kwargs)
+            if last_modified.tzinfo is None:
+                last_modified = last_modified.replace(tzinfo=timezone.utc) # Stored as naive UTC in SQLite
+            etag = page_etag(last_modified)
+
+            if etag in request.if_none_match:
+                response = make_response('', 304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            response.last_modified = last_modified
+            response.cache_control.private = True
+            response.cache_control.no_cache = True # Revalidate on every use
+            response.vary.add('Cookie')
+            return response
+        return decorated_function
+    return decorator
@@ -0,0 +1,85 @@
+import random
+import time
+from functools import wraps
+from flask import current_app, g, has_request_context, session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+# Read-replica routing.
+#
+# Each URI in READ_REPLICA_URIS becomes a "replica_<n>" bind. Views decorated with
+# @read_only send their queries to a random replica, unless:
+#   - the request has already written anything (it stays on the primary from then on),
+#   - the user wrote something in the last READ_YOUR_WRITES_SECONDS, so they see
+#     their own new ticket or comment rather than a lagging copy,
+#   - or the session is flushing.
+# Everything else, including every undecorated view, uses the primary.
+
+REPLICA_PREFIX = 'replica_'
+_PRIMARY_UNTIL = 'db_primary_until' # Flask session key holding the end of the read-your-writes window
+
+
+def configure(app):
+    """Register READ_REPLICA_URIS as binds. Call before db.init_app()."""
+    binds = app.config.setdefault('SQLALCHEMY_BINDS', {})
+    for i, uri in enumerate(app.config.get('READ_REPLICA_URIS') or []):
+        binds[f'{REPLICA_PREFIX}{i}'] = uri
+
+
+def _mark_write():
+    if has_request_context():
+        g.db_wrote = True
+
+
+def _use_replica():
+    if not has_request_context() or not g.get('db_read_only') or g.get('db_wrote'):
+        return False
+    primary_until = session.get(_PRIMARY_UNTIL)
+    return not (primary_until and primary_until > time.time())
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session that sends reads in @read_only views to a replica."""
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if clause is not None and getattr(clause, 'is_dml', False):
+                _mark_write()
+            elif not self._flushing and _use_replica():
+                replicas = [engine for key, engine in self._db.engines.items()
+                            if key and key.startswith(REPLICA_PREFIX)]
+                if replicas:
+                    return random.choice(replicas)
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _pin_after_flush(db_session, flush_context):
+    _mark_write()
+
+
+def read_only(f):
+    """Route this view's queries to a read replica, when one is configured."""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        g.db_read_only = True
+        try:
+            return f(*args, **kwargs)
+        finally:
+            g.db_read_only = False
+    return decorated_function
+
+
+def _reset_request_state():
+    g.db_read_only = False
+    g.db_wrote = False
+
+
+def _open_read_your_writes_window(response):
+    if g.get('db_wrote') and current_app.config.get('READ_REPLICA_URIS'):
+        session[_PRIMARY_UNTIL] = time.time() + current_app.config['READ_YOUR_WRITES_SECONDS']
+    return response
+
+
+def init_app(app):
+    app.before_request(_reset_request_state)
+    app.after_request(_open_read_your_writes_window)
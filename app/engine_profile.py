@@ -0,0 +1,95 @@
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from app import db
+
+# Engine tuning applied in create_app.
+#
+# DB_ENGINE_PROFILE=tuned (the default) sets these pragmas on every new SQLite
+# connection. WAL lets readers carry on while one writer commits, and busy_timeout
+# makes a second writer wait for the lock instead of failing with "database is
+# locked", which is what several gunicorn workers sharing one file need.
+# DB_ENGINE_PROFILE=stock leaves SQLite's defaults alone. Individual pragmas can be
+# overridden with SQLITE_PRAGMAS, e.g. "busy_timeout=10000,mmap_size=0".
+#
+# For server databases (Postgres, MySQL) the DB_POOL_* settings become
+# SQLALCHEMY_ENGINE_OPTIONS instead.
+
+TUNED_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',  # Only fsync at checkpoints; durable enough with WAL
+    'busy_timeout': 5000,     # ms
+    'mmap_size': 268435456,   # 256 MiB of the file read through the page cache
+    'cache_size': -65536,     # Negative means KiB, so 64 MiB per connection
+    'foreign_keys': 'ON',
+}
+
+PROFILES = {
+    'tuned': TUNED_PRAGMAS,
+    'stock': {},
+}
+
+_POOL_OPTIONS = {
+    'DB_POOL_SIZE': 'pool_size',
+    'DB_MAX_OVERFLOW': 'max_overflow',
+    'DB_POOL_TIMEOUT': 'pool_timeout',
+    'DB_POOL_RECYCLE': 'pool_recycle',
+    'DB_POOL_PRE_PING': 'pool_pre_ping',
+}
+
+
+def _parse_pragmas(value):
+    if not value:
+        return {}
+    if isinstance(value, dict):
+        return value
+    pragmas = {}
+    for item in value.split(','):
+        name, _, setting = item.partition('=')
+        pragmas[name.strip()] = setting.strip()
+    return pragmas
+
+
+def sqlite_pragmas(config):
+    """Pragmas to run on each new SQLite connection, in order."""
+    profile = config.get('DB_ENGINE_PROFILE') or 'tuned'
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown DB_ENGINE_PROFILE {profile!r}; expected one of {', '.join(PROFILES)}")
+    pragmas = dict(PROFILES[profile])
+    pragmas.update(_parse_pragmas(config.get('SQLITE_PRAGMAS')))
+    if _is_memory_database(config['SQLALCHEMY_DATABASE_URI']):
+        pragmas.pop('journal_mode', None) # In-memory databases cannot use WAL
+        pragmas.pop('mmap_size', None)
+    return pragmas
+
+
+def _is_memory_database(uri):
+    url = make_url(uri)
+    return url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:')
+
+
+def configure(app):
+    """Fill in SQLALCHEMY_ENGINE_OPTIONS from the DB_POOL_* settings. Call before db.init_app()."""
+    if make_url(app.config['SQLALCHEMY_DATABASE_URI']).get_backend_name() == 'sqlite':
+        return # SQLite connections are cheap and file-local; the pool defaults are fine
+    options = app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {})
+    for key, option in _POOL_OPTIONS.items():
+        if app.config.get(key) is not None:
+            options.setdefault(option, app.config[key])
+
+
+def init_app(app):
+    pragmas = sqlite_pragmas(app.config)
+    if not pragmas:
+        return
+
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        if engine.dialect.name == 'sqlite':
+            event.listen(engine, 'connect', set_pragmas)
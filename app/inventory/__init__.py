@@ -4,4 +4,5 @@ bp = Blueprint('inventory', __name__, template_folder='templates')
 
 # Import routes and forms after creating blueprint
 from . import routes
+from . import commands # 'flask inventory ...' CLI commands
 # from . import forms
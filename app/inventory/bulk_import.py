@@ -0,0 +1,120 @@
+import csv
+from datetime import datetime
+from sqlalchemy import insert
+from app import db, choices
+from app.models import Equipment
+from .forms import EQUIPMENT_TYPE_CHOICES, EQUIPMENT_STATUS_CHOICES
+
+# Bulk equipment import from CSV, e.g. a shipment manifest.
+#
+# All rows are validated first. Serial numbers are checked against the database with
+# one IN-query per SERIAL_LOOKUP_CHUNK serials (instead of a query per item) and
+# against the rest of the file with an in-memory set. The valid rows are then
+# inserted with executemany batches in a single transaction.
+
+COLUMNS = ['name', 'type', 'serial_number', 'manufacturer', 'model_number',
+           'purchase_date', 'warranty_expiry_date', 'status', 'notes']
+
+SERIAL_LOOKUP_CHUNK = 500
+
+_TYPES = {value for value, _ in EQUIPMENT_TYPE_CHOICES}
+# 'Assigned' needs a user; assign items individually after importing them
+_STATUSES = {value for value, _ in EQUIPMENT_STATUS_CHOICES} - {'Assigned'}
+
+
+class ImportReport:
+    def __init__(self):
+        self.created = 0
+        self.errors = [] # (row number, [messages]), row 1 being the header
+
+    @property
+    def ok(self):
+        return not self.errors
+
+
+def read_csv(stream):
+    """Rows of a CSV file object as dicts, with header names normalised."""
+    reader = csv.DictReader(stream)
+    reader.fieldnames = [(name or '').strip().lower().replace(' ', '_') for name in reader.fieldnames or []]
+    return reader
+
+
+def _date(value, field, errors):
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        errors.append(f"{field} must be YYYY-MM-DD, got {value!r}")
+        return None
+
+
+def _validate(raw):
+    row = {column: (raw.get(column) or '').strip() or None for column in COLUMNS}
+    errors = []
+    if not row['name']:
+        errors.append("name is required")
+    elif len(row['name']) > 120:
+        errors.append("name is longer than 120 characters")
+    if row['type'] not in _TYPES:
+        errors.append(f"type must be one of {', '.join(sorted(_TYPES))}")
+    row['status'] = row['status'] or 'In Stock'
+    if row['status'] not in _STATUSES:
+        errors.append(f"status must be one of {', '.join(sorted(_STATUSES))}")
+    for column in ('serial_number', 'manufacturer', 'model_number'):
+        if row[column] and len(row[column]) > 100:
+            errors.append(f"{column} is longer than 100 characters")
+    row['purchase_date'] = _date(row['purchase_date'], 'purchase_date', errors)
+    row['warranty_expiry_date'] = _date(row['warranty_expiry_date'], 'warranty_expiry_date', errors)
+    return row, errors
+
+
+def _existing_serials(serials):
+    existing = set()
+    serials = list(serials)
+    for start in range(0, len(serials), SERIAL_LOOKUP_CHUNK):
+        chunk = serials[start:start + SERIAL_LOOKUP_CHUNK]
+        existing.update(db.session.scalars(
+            db.select(Equipment.serial_number).where(Equipment.serial_number.in_(chunk))))
+    return existing
+
+
+def import_equipment(rows, batch_size=500, dry_run=False):
+    """
+    Validate and insert equipment rows. Rows with errors are reported and skipped;
+    every valid row is inserted (unless dry_run) in one transaction.
+    """
+    report = ImportReport()
+    valid = []
+    seen_serials = {}
+    for row_number, raw in enumerate(rows, start=2):
+        row, errors = _validate(raw)
+        serial = row['serial_number']
+        if serial:
+            if serial in seen_serials:
+                errors.append(f"serial number {serial} already appears on row {seen_serials[serial]}")
+            else:
+                seen_serials[serial] = row_number
+        if errors:
+            report.errors.append((row_number, errors))
+        else:
+            valid.append((row_number, row))
+
+    existing = _existing_serials(seen_serials)
+    if existing:
+        duplicates = [(n, [f"serial number {row['serial_number']} already exists"])
+                      for n, row in valid if row['serial_number'] in existing]
+        report.errors = sorted(report.errors + duplicates)
+        valid = [(n, row) for n, row in valid if row['serial_number'] not in existing]
+
+    if dry_run or not valid:
+        return report
+
+    # render_nulls keeps rows with different blank columns in the same executemany
+    stmt = insert(Equipment).execution_options(render_nulls=True)
+    for start in range(0, len(valid), batch_size):
+        db.session.execute(stmt, [row for _, row in valid[start:start + batch_size]])
+    db.session.commit()
+    choices.invalidate('equipment') # Bulk INSERT bypasses the mapper events that normally do this
+    report.created = len(valid)
+    return report
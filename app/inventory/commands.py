@@ -0,0 +1,19 @@
+import click
+from . import bp
+from .bulk_import import import_equipment, read_csv
+
+
+@bp.cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--batch-size', default=500, show_default=True, help="Rows per INSERT batch.")
+@click.option('--dry-run', is_flag=True, help="Validate the file without importing anything.")
+def import_command(path, batch_size, dry_run):
+    """Bulk import equipment from a CSV file at PATH."""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        report = import_equipment(read_csv(f), batch_size=batch_size, dry_run=dry_run)
+    for row_number, errors in report.errors:
+        click.echo(f"Row {row_number}: {'; '.join(errors)}", err=True)
+    if dry_run:
+        click.echo(f"Dry run: {len(report.errors)} rows with errors.")
+    else:
+        click.echo(f"Imported {report.created} items; {len(report.errors)} rows skipped.")
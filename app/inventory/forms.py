@@ -1,7 +1,8 @@
 from flask_wtf import FlaskForm
+from flask_wtf.file import FileField, FileRequired, FileAllowed
 from wtforms import StringField, TextAreaField, SelectField, SubmitField, DateField
 from wtforms.validators import DataRequired, Length, Optional
-from app.models import User # To populate user choices for assignment
+from app.choices import user_choices, LookupSelect # Cached user choices for assignment
 
 EQUIPMENT_STATUS_CHOICES = [
     ('In Stock', 'In Stock'),
@@ -39,13 +40,18 @@ class EquipmentForm(FlaskForm):
     submit = SubmitField('Save Equipment')
 
 class AssignEquipmentForm(FlaskForm):
-    assigned_to_user_id = SelectField('Assign to User', coerce=int, validators=[Optional()]) # Optional to allow unassignment
+    assigned_to_user_id = SelectField('Assign to User', coerce=int, validators=[Optional()], # Optional to allow unassignment
+                                      widget=LookupSelect('inventory.lookup_users'))
     submit = SubmitField('Update Assignment')
 
     def __init__(self, *args, **kwargs):
         super(AssignEquipmentForm, self).__init__(*args, **kwargs)
         # Populate choices with all users. (0, 'Unassign') allows clearing the assignment.
-        self.assigned_to_user_id.choices = [(0, 'Unassign / In Stock')] + [(user.id, f"{user.username} ({user.email})") for user in User.query.order_by(User.username).all()]
+        self.assigned_to_user_id.choices = [(0, 'Unassign / In Stock')] + user_choices()
+
+class EquipmentImportForm(FlaskForm):
+    file = FileField('Equipment CSV', validators=[FileRequired(), FileAllowed(['csv'], 'CSV files only.')])
+    submit = SubmitField('Import Equipment')
 
 # We might not need a separate EditEquipmentForm if EquipmentForm is flexible enough
 # and existing data is populated correctly. For now, EquipmentForm can serve both.
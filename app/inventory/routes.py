@@ -1,21 +1,43 @@
-from flask import render_template, redirect, url_for, flash, request, abort
+from flask import render_template, redirect, url_for, flash, request, abort, jsonify
 from flask_login import current_user, login_required
-from .forms import EquipmentForm, AssignEquipmentForm
-from app.models import Equipment, User
+from .forms import EquipmentForm, AssignEquipmentForm, EquipmentImportForm
+from .bulk_import import COLUMNS as IMPORT_COLUMNS, import_equipment, read_csv
+from app.models import Equipment, User, Ticket
 from app import db
 from . import bp
 from app.decorators import it_support_required # Use the decorator
+from app.query_counter import query_budget
+from app.db_routing import read_only
+from app.conditional import conditional_get
+from sqlalchemy.orm import joinedload, selectinload
 from datetime import datetime, timezone
+import csv
+import io
 
 @bp.route('/')
+@read_only
+@query_budget(2)
 @login_required
 @it_support_required # Only IT support and admins can access inventory
 def list_equipment():
-    equipment_list = Equipment.query.order_by(Equipment.name).all()
+    equipment_list = Equipment.query.options(joinedload(Equipment.assigned_user)).order_by(Equipment.name).all()
     return render_template('inventory/list_equipment.html',
                            equipment_list=equipment_list,
                            title="Equipment Inventory")
 
+@bp.route('/lookup/users')
+@login_required
+@it_support_required
+def lookup_users():
+    # Type-ahead for AssignEquipmentForm once the user list is too long for a dropdown
+    term = request.args.get('q', '').strip()
+    rows = db.session.execute(
+        db.select(User.id, User.username, User.email)
+        .filter(db.or_(User.username.startswith(term, autoescape=True),
+                       User.email.startswith(term, autoescape=True)))
+        .order_by(User.username).limit(20))
+    return jsonify([{'id': r.id, 'text': f"{r.username} ({r.email})"} for r in rows])
+
 @bp.route('/new', methods=['GET', 'POST'])
 @login_required
 @it_support_required
@@ -46,11 +68,45 @@ def add_equipment():
         return redirect(url_for('inventory.view_equipment', equipment_id=equipment.id))
     return render_template('inventory/add_equipment.html', title='Add New Equipment', form=form)
 
+@bp.route('/import', methods=['GET', 'POST'])
+@login_required
+@it_support_required
+def import_equipment_csv():
+    form = EquipmentImportForm()
+    report = None
+    if form.validate_on_submit():
+        stream = io.TextIOWrapper(form.file.data.stream, encoding='utf-8-sig')
+        try:
+            report = import_equipment(read_csv(stream))
+        except (UnicodeDecodeError, csv.Error) as e:
+            flash(f'Could not read the uploaded file: {e}', 'danger')
+        else:
+            if report.created:
+                flash(f'{report.created} equipment items imported.', 'success')
+            if report.errors:
+                flash(f'{len(report.errors)} rows were skipped; see the report below.', 'warning')
+    return render_template('inventory/import_equipment.html', title='Import Equipment',
+                           form=form, report=report, columns=IMPORT_COLUMNS)
+
+def _equipment_last_modified(equipment_id):
+    # The page also lists the equipment's tickets, whose changes don't touch Equipment.updated_at
+    latest_ticket = db.select(db.func.max(Ticket.updated_at)) \
+        .where(Ticket.equipment_id == Equipment.id).scalar_subquery()
+    row = db.session.execute(db.select(Equipment.updated_at, latest_ticket)
+                             .where(Equipment.id == equipment_id)).first()
+    if row is None:
+        return None
+    return max(filter(None, row), default=None)
+
 @bp.route('/<int:equipment_id>', methods=['GET'])
+@read_only
+@query_budget(4)
 @login_required
 @it_support_required # Viewing specific equipment might be IT only, or broader if needed
+@conditional_get(_equipment_last_modified)
 def view_equipment(equipment_id):
-    equipment = Equipment.query.get_or_404(equipment_id)
+    equipment = Equipment.query.options(joinedload(Equipment.assigned_user),
+                                        selectinload(Equipment.tickets)).get_or_404(equipment_id)
     form = EquipmentForm(obj=equipment) # For the edit form part of the page
     assign_form = AssignEquipmentForm(obj=equipment) # For the assignment part
     if equipment.assigned_to_user_id:
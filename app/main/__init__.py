@@ -1,6 +1,6 @@
 from flask import Blueprint
 
-bp = Blueprint('main', __name__)
+bp = Blueprint('main', __name__, template_folder='templates')
 
 # Import routes after creating blueprint to avoid circular imports
 from . import routes
@@ -0,0 +1,191 @@
+import threading
+import time
+from flask import Response, abort, current_app, g, request, before_render_template, template_rendered
+from sqlalchemy import event
+from app import db
+
+# Opt-in (METRICS_ENABLED) request instrumentation exposed in Prometheus text format
+# at /metrics: per-endpoint latency, SQL statement count and time, response size,
+# and per-template render time. Figures are per process; with several gunicorn
+# workers, Prometheus scrapes see whichever worker answers, so alert on rates and
+# quantiles rather than absolute counts.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Extra series computed at scrape time: name -> (type, help, callable returning {labels: value})
+        self.collectors = {}
+        self.reset()
+
+    def reset(self):
+        self.request_latency = {}   # endpoint -> Histogram (seconds)
+        self.request_queries = {}   # endpoint -> Histogram (statements per request)
+        self.response_size = {}     # endpoint -> Histogram (bytes)
+        self.template_render = {}   # template -> Histogram (seconds)
+        self.requests_total = {}    # (endpoint, method, status) -> count
+        self.sql_seconds_total = {} # endpoint -> seconds
+
+    def _observe(self, family, key, buckets, value):
+        with self._lock:
+            histogram = family.get(key)
+            if histogram is None:
+                histogram = family[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def record_request(self, endpoint, method, status, seconds, queries, sql_seconds, size):
+        self._observe(self.request_latency, endpoint, LATENCY_BUCKETS, seconds)
+        self._observe(self.request_queries, endpoint, QUERY_COUNT_BUCKETS, queries)
+        if size is not None:
+            self._observe(self.response_size, endpoint, SIZE_BUCKETS, size)
+        with self._lock:
+            key = (endpoint, method, str(status))
+            self.requests_total[key] = self.requests_total.get(key, 0) + 1
+            self.sql_seconds_total[endpoint] = self.sql_seconds_total.get(endpoint, 0.0) + sql_seconds
+
+    def record_template(self, template, seconds):
+        self._observe(self.template_render, template, LATENCY_BUCKETS, seconds)
+
+    def register_collector(self, name, metric_type, help_text, collect):
+        self.collectors[name] = (metric_type, help_text, collect)
+
+    def render(self):
+        lines = []
+        with self._lock:
+            _histogram_lines(lines, 'http_request_duration_seconds', 'Request latency by endpoint.',
+                             'endpoint', self.request_latency)
+            _histogram_lines(lines, 'http_request_sql_statements', 'SQL statements executed per request.',
+                             'endpoint', self.request_queries)
+            _histogram_lines(lines, 'http_response_size_bytes', 'Response body size by endpoint.',
+                             'endpoint', self.response_size)
+            _histogram_lines(lines, 'template_render_duration_seconds', 'Template render time.',
+                             'template', self.template_render)
+            lines.append('# HELP http_requests_total Requests handled.')
+            lines.append('# TYPE http_requests_total counter')
+            for (endpoint, method, status), value in sorted(self.requests_total.items()):
+                lines.append(f'http_requests_total{{endpoint="{_escape(endpoint)}",method="{method}",status="{status}"}} {value}')
+            lines.append('# HELP http_request_sql_seconds_total Time spent executing SQL by endpoint.')
+            lines.append('# TYPE http_request_sql_seconds_total counter')
+            for endpoint, value in sorted(self.sql_seconds_total.items()):
+                lines.append(f'http_request_sql_seconds_total{{endpoint="{_escape(endpoint)}"}} {value:.6f}')
+        for name, (metric_type, help_text, collect) in sorted(self.collectors.items()):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            for labels, value in sorted(collect().items()):
+                label_text = ','.join(f'{k}="{_escape(v)}"' for k, v in labels)
+                lines.append(f'{name}{{{label_text}}} {value}' if label_text else f'{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _histogram_lines(lines, name, help_text, label, family):
+    lines.append(f'# HELP {name} {help_text}')
+    lines.append(f'# TYPE {name} histogram')
+    for key, histogram in sorted(family.items()):
+        key = _escape(key)
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{label}="{key}",le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{label}="{key}",le="+Inf"}} {histogram.count}')
+        lines.append(f'{name}_sum{{{label}="{key}"}} {histogram.sum:.6f}')
+        lines.append(f'{name}_count{{{label}="{key}"}} {histogram.count}')
+
+
+registry = Registry()
+
+
+def _enabled():
+    return current_app.config.get('METRICS_ENABLED')
+
+
+def _start_request():
+    if _enabled():
+        g.metrics_start = time.perf_counter()
+        g.metrics_sql_seconds = 0.0
+        g.metrics_sql_count = 0
+
+
+def _finish_request(response):
+    start = g.get('metrics_start')
+    if start is not None and request.endpoint != 'metrics':
+        size = None if response.is_streamed else response.calculate_content_length()
+        registry.record_request(request.endpoint or 'unmatched', request.method, response.status_code,
+                                time.perf_counter() - start, g.metrics_sql_count, g.metrics_sql_seconds, size)
+    return response
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('metrics_query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info['metrics_query_start'].pop()
+    if g and g.get('metrics_start') is not None:
+        g.metrics_sql_seconds += time.perf_counter() - started
+        g.metrics_sql_count += 1
+
+
+def _before_render(sender, template, context, **extra):
+    if g and g.get('metrics_start') is not None:
+        g.setdefault('metrics_render_starts', []).append(time.perf_counter())
+
+
+def _after_render(sender, template, context, **extra):
+    starts = g.get('metrics_render_starts') if g else None
+    if starts:
+        registry.record_template(template.name or 'string', time.perf_counter() - starts.pop())
+
+
+def metrics_view():
+    if not _enabled():
+        abort(404)
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4')
+
+
+def init_app(app):
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_after_render, app)
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
+
+    from . import choices, models
+    registry.register_collector('user_loader_cache_requests_total', 'counter',
+                                'user_loader identity cache lookups.',
+                                lambda: _cache_counts(models.user_cache_stats()))
+    registry.register_collector('choice_list_cache_requests_total', 'counter',
+                                'Form choice list cache lookups.',
+                                lambda: _cache_counts(choices.cache_stats()))
+
+
+def _cache_counts(stats):
+    return {(('result', 'hit'),): stats['hits'], (('result', 'miss'),): stats['misses']}
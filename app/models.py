@@ -1,7 +1,10 @@
 from datetime import datetime, timezone
 from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import UserMixin
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
 from . import db, login_manager # Import from app package (app/__init__.py)
+from .cache import LRUCache
 
 class User(UserMixin, db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -27,9 +30,54 @@ class User(UserMixin, db.Model):
     def __repr__(self):
         return f'<User {self.username}>'
 
+# Per-process identity cache in front of the user_loader, which otherwise costs a
+# query on every authenticated request. Entries are detached snapshots of the row;
+# a hit is merged into the request's session with load=False, i.e. without SQL.
+# Any update/delete of a User evicts it (role changes must reach role_required
+# immediately); USER_CACHE_TTL bounds staleness for changes made by other workers.
+_user_cache = LRUCache(maxsize=1024, ttl=60)
+
+def init_user_cache(app):
+    _user_cache.maxsize = app.config['USER_CACHE_SIZE']
+    _user_cache.ttl = app.config['USER_CACHE_TTL']
+    _user_cache.clear()
+
+def user_cache_stats():
+    return _user_cache.stats()
+
+def _snapshot(user):
+    copy = User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+    make_transient_to_detached(copy)
+    return copy
+
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    user_id = int(user_id)
+    cached = _user_cache.get(user_id)
+    if cached is not None:
+        return db.session.merge(cached, load=False)
+    user = db.session.get(User, user_id)
+    if user is not None:
+        _user_cache.set(user_id, _snapshot(user))
+    return user
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _evict_cached_user(mapper, connection, target):
+    _user_cache.pop(target.id)
+    # Evict again at commit, in case another request re-cached the old row in between
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault('evicted_user_ids', set()).add(target.id)
+
+@event.listens_for(Session, 'after_commit')
+def _evict_committed_users(session):
+    for user_id in session.info.pop('evicted_user_ids', ()):
+        _user_cache.pop(user_id)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_evicted_users(session):
+    session.info.pop('evicted_user_ids', None)
 
 class Ticket(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -50,6 +98,16 @@ class Ticket(db.Model):
     # Comments could be a separate model or a JSON field if the DB supports it well
     # For now, let's plan for a separate Comment model later if needed.
 
+    # Composite indexes backing the keyset-paginated ticket lists (newest first)
+    # and the status/priority/assignee/equipment filters and facet counts
+    __table_args__ = (
+        db.Index('ix_ticket_created_at_id', 'created_at', 'id'),
+        db.Index('ix_ticket_reporter_id_created_at_id', 'reporter_id', 'created_at', 'id'),
+        db.Index('ix_ticket_status_priority_created_at', 'status', 'priority', 'created_at'),
+        db.Index('ix_ticket_assignee_id_status_created_at', 'assignee_id', 'status', 'created_at'),
+        db.Index('ix_ticket_equipment_id_created_at', 'equipment_id', 'created_at'),
+    )
+
     def __repr__(self):
         return f'<Ticket {self.id} - {self.title}>'
 
@@ -88,6 +146,11 @@ class Comment(db.Model):
     author = db.relationship('User', backref=db.backref('comments', lazy='dynamic'))
     ticket = db.relationship('Ticket', backref=db.backref('comments', lazy='dynamic', order_by="Comment.created_at.asc()"))
 
+    __table_args__ = (
+        # A ticket's thread in order, seekable for keyset pagination
+        db.Index('ix_comment_ticket_id_created_at_id', 'ticket_id', 'created_at', 'id'),
+    )
+
     def __repr__(self):
         return f'<Comment {self.id} by User {self.user_id} on Ticket {self.ticket_id}>'
 
@@ -0,0 +1,90 @@
+import base64
+import binascii
+from datetime import datetime
+from app import db
+
+
+class KeysetPage:
+    """
+    One page of a keyset (cursor) paginated result.
+    `next_cursor` / `prev_cursor` are opaque tokens to pass back as `after` / `before`,
+    or None when there is nothing further in that direction.
+    """
+    def __init__(self, items, next_cursor=None, prev_cursor=None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def encode_cursor(values):
+    # Cursor values are (datetime, int) pairs, e.g. (created_at, id)
+    raw = '|'.join(v.isoformat() if isinstance(v, datetime) else str(v) for v in values)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """Returns the (datetime, int) pair stored in a cursor, or None if the token is malformed."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode('utf-8')
+        timestamp, row_id = raw.rsplit('|', 1)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        return None
+
+
+def keyset_paginate(stmt, columns, after=None, before=None, per_page=25, descending=True, scalars=True):
+    """
+    Paginate a select() statement on a unique, indexed (timestamp, id) column pair.
+
+    Instead of OFFSET (which scans every skipped row), each page seeks directly to the
+    cursor position, so the cost of a page does not grow with how deep it is.
+
+    :param stmt: select() to paginate; must not already have ORDER BY / LIMIT.
+    :param columns: (timestamp_column, id_column) tuple, e.g. (Ticket.created_at, Ticket.id).
+    :param after: cursor token; return the page following it.
+    :param before: cursor token; return the page preceding it.
+    :param scalars: True for entity selects, False for column/row selects.
+    """
+    key = db.tuple_(*columns)
+    after_values = decode_cursor(after)
+    before_values = decode_cursor(before)
+
+    # Walking backwards means flipping the sort order and the comparison, then
+    # reversing the fetched rows so the page is still displayed in natural order.
+    backwards = before_values is not None and after_values is None
+    forward_desc = descending != backwards
+    if backwards:
+        stmt = stmt.where(key > before_values if descending else key < before_values)
+    elif after_values is not None:
+        stmt = stmt.where(key < after_values if descending else key > after_values)
+
+    order = [c.desc() if forward_desc else c.asc() for c in columns]
+    stmt = stmt.order_by(*order).limit(per_page + 1) # One extra row tells us whether another page exists
+
+    result = db.session.execute(stmt)
+    rows = result.scalars().all() if scalars else result.all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backwards:
+        rows.reverse()
+
+    def cursor_for(item):
+        return encode_cursor([getattr(item, c.key) for c in columns])
+
+    next_cursor = prev_cursor = None
+    if rows:
+        if backwards:
+            prev_cursor = cursor_for(rows[0]) if has_more else None
+            next_cursor = cursor_for(rows[-1])
+        else:
+            next_cursor = cursor_for(rows[-1]) if has_more else None
+            prev_cursor = cursor_for(rows[0]) if after_values is not None else None
+    return KeysetPage(rows, next_cursor=next_cursor, prev_cursor=prev_cursor)
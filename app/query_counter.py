@@ -0,0 +1,78 @@
+import logging
+from functools import wraps
+from flask import current_app, g, has_app_context, request
+from sqlalchemy import event
+from app import db
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryCounter:
+    """
+    Context manager that records every SQL statement executed on the app's engines.
+    Handy in tests:  with QueryCounter() as queries: ...;  queries.count
+    """
+    def __init__(self):
+        self.statements = []
+        self._engines = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        self._engines = list(db.engines.values())
+        for engine in self._engines:
+            event.listen(engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        for engine in self._engines:
+            event.remove(engine, 'before_cursor_execute', self._record)
+        return False
+
+
+def _count_request_query(conn, cursor, statement, parameters, context, executemany):
+    if has_app_context():
+        g.query_count = g.get('query_count', 0) + 1
+
+
+def request_query_count():
+    """Number of statements executed so far while handling the current request."""
+    return g.get('query_count', 0)
+
+
+def query_budget(max_queries):
+    """
+    Decorator declaring the most statements an endpoint may execute, counting the
+    user_loader and template rendering. Exceeding it logs a warning, or raises
+    QueryBudgetExceeded when QUERY_BUDGET_STRICT is set (as it is in the tests).
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            start = request_query_count()
+            response = f(*args, **kwargs)
+            used = request_query_count() - start
+            if used > max_queries:
+                message = f"{request.endpoint} executed {used} queries (budget {max_queries})"
+                if current_app.config.get('QUERY_BUDGET_STRICT'):
+                    raise QueryBudgetExceeded(message)
+                logger.warning(message)
+            return response
+        return decorated_function
+    return decorator
+
+
+def init_app(app):
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', _count_request_query)
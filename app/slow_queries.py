@@ -0,0 +1,203 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+import click
+from flask import current_app, has_app_context, has_request_context, request
+from flask.cli import with_appcontext
+from flask_migrate.cli import db as db_cli
+from sqlalchemy import event, inspect
+from app import db
+
+# Slow-query log. Every statement slower than SLOW_QUERY_THRESHOLD_MS is appended to
+# SLOW_QUERY_LOG as one JSON line with its duration, the endpoint that ran it, the
+# shape (not the values) of its parameters and, on SQLite, its EXPLAIN QUERY PLAN.
+# `flask db advise-indexes` reads that file back and suggests indexes for the
+# full-table scans it finds.
+
+logger = logging.getLogger(__name__)
+_write_lock = threading.Lock()
+
+_EXPLAINABLE = ('SELECT', 'UPDATE', 'DELETE', 'WITH')
+
+
+def parameter_shape(parameters):
+    """Bound parameters with each value replaced by its type name."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def explain(cursor, statement, parameters):
+    """EXPLAIN QUERY PLAN detail lines for a statement, run on the raw DBAPI connection."""
+    if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+        return None
+    try:
+        rows = cursor.connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    except Exception as e: # Never let diagnostics break the query being diagnosed
+        logger.debug("EXPLAIN failed: %s", e)
+        return None
+    return [row[3] for row in rows]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('slow_query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info['slow_query_start'].pop()) * 1000
+    threshold = current_app.config.get('SLOW_QUERY_THRESHOLD_MS') if has_app_context() else None
+    if threshold is None or elapsed_ms < threshold:
+        return
+    plan = None
+    if conn.dialect.name == 'sqlite' and not executemany:
+        plan = explain(cursor, statement, parameters)
+    entry = {
+        'at': datetime.now(timezone.utc).isoformat(),
+        'duration_ms': round(elapsed_ms, 3),
+        'endpoint': request.endpoint if has_request_context() else None,
+        'statement': statement,
+        'parameters': parameter_shape(parameters[0] if executemany and parameters else parameters),
+        'executemany': executemany,
+        'plan': plan,
+    }
+    logger.warning("Slow query (%.1f ms) in %s: %s", elapsed_ms, entry['endpoint'], statement)
+    with _write_lock, open(current_app.config['SLOW_QUERY_LOG'], 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry) + '\n')
+
+
+def init_app(app):
+    if not app.config.get('SLOW_QUERY_LOG'):
+        app.config['SLOW_QUERY_LOG'] = os.path.join(app.instance_path, 'slow_queries.jsonl')
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def read_log(path):
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+# --- Index advisor -------------------------------------------------------------
+
+_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: AS (\w+))?$') # A bare SCAN, i.e. without USING INDEX
+_ALIAS = re.compile(r'\b(?:FROM|JOIN)\s+(\w+)\s+AS\s+(\w+)', re.IGNORECASE)
+_EQUALITY = re.compile(r'\b(\w+)\.(\w+)\s*(?:=|IN\b|IS\b)', re.IGNORECASE)
+_EQUALITY_RHS = re.compile(r'=\s*(\w+)\.(\w+)\b')
+_RANGE = re.compile(r'\b(\w+)\.(\w+)\s*(?:<=|>=|<|>|BETWEEN\b)', re.IGNORECASE)
+
+
+class IndexSuggestion:
+    def __init__(self, table, columns):
+        self.table = table
+        self.columns = columns
+        self.count = 0
+        self.total_ms = 0.0
+        self.endpoints = set()
+
+    @property
+    def name(self):
+        return f"ix_{self.table}_{'_'.join(self.columns)}"
+
+
+def _ordered_unique(values):
+    return list(dict.fromkeys(values))
+
+
+def _scanned_columns(statement, alias):
+    """Columns of `alias` the statement filters or joins on: equality columns first, then one range column."""
+    where = statement.split(' FROM ', 1)[-1] # Skip the select list
+    equality = [col for name, col in _EQUALITY.findall(where) if name == alias]
+    equality += [col for name, col in _EQUALITY_RHS.findall(where) if name == alias]
+    ranged = [col for name, col in _RANGE.findall(where) if name == alias and col not in equality]
+    return _ordered_unique(equality) + ranged[:1]
+
+
+def _indexed_prefixes(inspector, table):
+    prefixes = [tuple(index['column_names']) for index in inspector.get_indexes(table)]
+    prefixes += [tuple(constraint['column_names']) for constraint in inspector.get_unique_constraints(table)]
+    prefixes.append(tuple(inspector.get_pk_constraint(table)['constrained_columns']))
+    return prefixes
+
+
+def advise_indexes(entries, inspector):
+    """Aggregate full-scan patterns from slow-query log entries into IndexSuggestions."""
+    tables = set(inspector.get_table_names())
+    suggestions = {}
+    for entry in entries:
+        statement = (entry.get('statement') or '').replace('"', '')
+        aliases = {alias: table for table, alias in _ALIAS.findall(statement)}
+        for detail in entry.get('plan') or []:
+            match = _SCAN.match(detail)
+            if not match:
+                continue
+            alias = match.group(2) or match.group(1)
+            table = aliases.get(alias, match.group(1))
+            if table not in tables:
+                continue # SCAN CONSTANT ROW, subqueries, FTS tables, ...
+            columns = _scanned_columns(statement, alias)
+            if not columns:
+                continue # Unfiltered scan; no index would help
+            key = (table, tuple(columns))
+            suggestion = suggestions.get(key)
+            if suggestion is None:
+                suggestion = suggestions[key] = IndexSuggestion(table, list(columns))
+            suggestion.count += 1
+            suggestion.total_ms += entry.get('duration_ms', 0)
+            if entry.get('endpoint'):
+                suggestion.endpoints.add(entry['endpoint'])
+
+    existing = defaultdict(list)
+    for table in {table for table, _ in suggestions}:
+        existing[table] = _indexed_prefixes(inspector, table)
+    return sorted((s for s in suggestions.values()
+                   if not any(prefix[:len(s.columns)] == tuple(s.columns) for prefix in existing[s.table])),
+                  key=lambda s: s.total_ms, reverse=True)
+
+
+def migration_snippet(suggestions):
+    by_table = defaultdict(list)
+    for suggestion in suggestions:
+        by_table[suggestion.table].append(suggestion)
+    upgrade, downgrade = ["def upgrade():"], ["def downgrade():"]
+    for table, table_suggestions in by_table.items():
+        upgrade.append(f"    with op.batch_alter_table('{table}', schema=None) as batch_op:")
+        downgrade.append(f"    with op.batch_alter_table('{table}', schema=None) as batch_op:")
+        for s in table_suggestions:
+            upgrade.append(f"        batch_op.create_index('{s.name}', {s.columns!r}, unique=False)")
+        for s in reversed(table_suggestions):
+            downgrade.append(f"        batch_op.drop_index('{s.name}')")
+    return '\n'.join(upgrade + [''] + downgrade)
+
+
+@db_cli.command('advise-indexes')
+@click.option('--log', 'log_path', type=click.Path(dir_okay=False),
+              help="Slow-query log to analyse. Defaults to SLOW_QUERY_LOG.")
+@click.option('--min-count', default=1, show_default=True, help="Ignore patterns seen fewer times than this.")
+@with_appcontext
+def advise_indexes_command(log_path, min_count):
+    """Suggest indexes for full-table scans recorded in the slow-query log."""
+    log_path = log_path or current_app.config['SLOW_QUERY_LOG']
+    if not os.path.exists(log_path):
+        raise click.ClickException(f"No slow-query log at {log_path}. Set SLOW_QUERY_THRESHOLD_MS to start one.")
+    suggestions = [s for s in advise_indexes(read_log(log_path), inspect(db.engine)) if s.count >= min_count]
+    if not suggestions:
+        click.echo("No missing indexes found.")
+        return
+    for s in suggestions:
+        endpoints = ', '.join(sorted(s.endpoints)) or 'outside a request'
+        click.echo(f"{s.table} ({', '.join(s.columns)}): {s.count} slow full scans, "
+                   f"{s.total_ms:.1f} ms total, from {endpoints}")
+    click.echo("\nSuggested migration (flask db revision -m \"Add indexes\"):\n")
+    click.echo(migration_snippet(suggestions))
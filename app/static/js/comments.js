@@ -0,0 +1,31 @@
+// "Load more comments" on the ticket page. Without JavaScript the link opens the
+// next page of the thread; with it, the next page is fetched from the JSON fragment
+// endpoint in data-fragment-url and appended to the thread in place.
+document.addEventListener('DOMContentLoaded', function () {
+    var link = document.getElementById('load-more-comments');
+    if (!link) {
+        return;
+    }
+    var thread = document.getElementById(link.dataset.target);
+    link.addEventListener('click', function (event) {
+        event.preventDefault();
+        if (link.dataset.loading) {
+            return;
+        }
+        link.dataset.loading = '1';
+        fetch(link.dataset.fragmentUrl, {headers: {'Accept': 'application/json'}})
+            .then(function (response) { return response.json(); })
+            .then(function (page) {
+                thread.insertAdjacentHTML('beforeend', page.html);
+                if (page.next_url) {
+                    link.dataset.fragmentUrl = page.next_url;
+                    delete link.dataset.loading;
+                } else {
+                    link.parentNode.remove();
+                }
+            })
+            .catch(function () {
+                window.location = link.href; // Fall back to a full page load
+            });
+    });
+});
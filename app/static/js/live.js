@@ -0,0 +1,29 @@
+// Live updates for the ticket list. Listens on the /tickets/stream Server-Sent
+// Events feed and, instead of re-rendering rows, shows a banner counting the tickets
+// that changed since the page loaded, with a link to refresh.
+document.addEventListener('DOMContentLoaded', function () {
+    var banner = document.getElementById('live-updates');
+    if (!banner || !window.EventSource) {
+        return;
+    }
+    var label = banner.querySelector('span');
+    var changed = {};
+    var source = new EventSource(banner.dataset.streamUrl);
+
+    function show(text) {
+        label.textContent = text;
+        banner.hidden = false;
+    }
+
+    ['created', 'updated', 'commented'].forEach(function (type) {
+        source.addEventListener(type, function (message) {
+            var event = JSON.parse(message.data);
+            changed[event.ticket_id] = true;
+            var count = Object.keys(changed).length;
+            show(count === 1 ? '1 ticket has changed.' : count + ' tickets have changed.');
+        });
+    });
+    source.addEventListener('resync', function () {
+        show('Tickets have changed.');
+    });
+});
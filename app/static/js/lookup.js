@@ -0,0 +1,39 @@
+// Type-ahead for choice fields rendered by app.choices.LookupSelect.
+// The visible text box queries data-lookup-url and stores the chosen id in the
+// hidden input named by data-lookup-target; clearing the box restores data-lookup-empty.
+document.addEventListener('DOMContentLoaded', function () {
+    document.querySelectorAll('input[data-lookup-url]').forEach(function (input) {
+        var hidden = document.getElementById(input.dataset.lookupTarget);
+        var list = document.createElement('datalist');
+        list.id = input.id + '-options';
+        input.setAttribute('list', list.id);
+        input.after(list);
+
+        var ids = {};
+        var timer = null;
+        input.addEventListener('input', function () {
+            if (ids[input.value] !== undefined) {
+                hidden.value = ids[input.value];
+                return;
+            }
+            if (input.value === '') {
+                hidden.value = input.dataset.lookupEmpty;
+            }
+            clearTimeout(timer);
+            timer = setTimeout(function () {
+                fetch(input.dataset.lookupUrl + '?q=' + encodeURIComponent(input.value))
+                    .then(function (response) { return response.json(); })
+                    .then(function (items) {
+                        list.innerHTML = '';
+                        ids = {};
+                        items.forEach(function (item) {
+                            var option = document.createElement('option');
+                            option.value = item.text;
+                            list.appendChild(option);
+                            ids[item.text] = item.id;
+                        });
+                    });
+            }, 200);
+        });
+    });
+});
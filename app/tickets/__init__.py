@@ -3,5 +3,8 @@ from flask import Blueprint
 bp = Blueprint('tickets', __name__, template_folder='templates')
 
 # Import routes and forms after creating blueprint
+from . import live
+bp.record_once(lambda state: live.init_app(state.app)) # Per-app event hub for /tickets/stream
 from . import routes
+from . import commands # 'flask tickets ...' CLI commands
 # from . import forms
@@ -0,0 +1,65 @@
+import click
+from app import db
+from . import bp
+from .search import is_supported, rebuild_search_index
+from .importer import Checkpoint, detect_format, import_tickets, read_records
+from .filters import TicketFilters
+from . import export
+
+
+@bp.cli.command('rebuild-search-index')
+def rebuild_search_index_command():
+    """Rebuild the full-text search index from all tickets and comments."""
+    with db.engine.begin() as connection:
+        if not is_supported(connection):
+            raise click.ClickException("Full-text search requires SQLite with FTS5.")
+        indexed = rebuild_search_index(connection)
+    click.echo(f"Indexed {indexed} documents.")
+
+
+@bp.cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']),
+              help="Input format. Defaults to csv for *.csv files, jsonl otherwise.")
+@click.option('--batch-size', default=1000, show_default=True, help="Tickets inserted per transaction.")
+@click.option('--checkpoint', 'checkpoint_path',
+              help="Progress file used to resume after a crash. Defaults to PATH.checkpoint.")
+@click.option('--restart', is_flag=True, help="Ignore an existing checkpoint and import from the start.")
+def import_command(path, fmt, batch_size, checkpoint_path, restart):
+    """Bulk import tickets (and, for JSONL, their comments) from PATH."""
+    checkpoint = Checkpoint(checkpoint_path or f"{path}.checkpoint", path)
+    if restart:
+        checkpoint.clear()
+
+    def report(record_number, message):
+        click.echo(f"Record {record_number}: skipped, {message}", err=True)
+
+    try:
+        stats = import_tickets(read_records(path, fmt or detect_format(path)),
+                               batch_size=batch_size, checkpoint=checkpoint, on_error=report)
+    except ValueError as e: # Malformed input file or mismatched checkpoint
+        raise click.ClickException(str(e))
+    if stats.resumed_from:
+        click.echo(f"Resumed after record {stats.resumed_from}.")
+    click.echo(f"Imported {stats.tickets} tickets and {stats.comments} comments; skipped {stats.skipped} records.")
+
+
+@bp.cli.command('export')
+@click.option('--format', 'fmt', type=click.Choice(list(export.FORMATS)), default='csv', show_default=True)
+@click.option('--dataset', type=click.Choice(export.DATASETS), default='tickets', show_default=True)
+@click.option('--gzip', 'compress', is_flag=True, help="Gzip the output.")
+@click.option('--output', '-o', type=click.Path(dir_okay=False), help="Output file. Defaults to stdout.")
+@click.option('--status')
+@click.option('--priority')
+@click.option('--assignee-id', help="User id, or 'none' for unassigned.")
+@click.option('--equipment-id', help="Equipment id, or 'none'.")
+@click.option('--created-from', help="YYYY-MM-DD")
+@click.option('--created-to', help="YYYY-MM-DD, inclusive")
+def export_command(fmt, dataset, compress, output, **filter_args):
+    """Stream tickets or comments matching the list view filters."""
+    filters = TicketFilters.from_args({k: v for k, v in filter_args.items() if v is not None})
+    chunks = export.export_stream(dataset, fmt, filters, compress=compress)
+    stream = click.open_file(output or '-', 'wb' if compress else 'w')
+    with stream:
+        for chunk in chunks:
+            stream.write(chunk)
@@ -0,0 +1,99 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from sqlalchemy.orm import aliased
+from app import db
+from app.models import Ticket, Comment, User
+
+# Streaming ticket/comment dumps. Rows are pulled from the database in yield_per
+# sized chunks and encoded into output chunks as they arrive, so an export of any
+# size runs in constant memory and starts sending bytes immediately.
+
+FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+
+DATASETS = ('tickets', 'comments')
+
+ROWS_PER_FETCH = 1000
+ROWS_PER_CHUNK = 500 # Rows encoded per yielded chunk of output
+
+
+def _ticket_query(filters, visibility):
+    reporter = aliased(User)
+    assignee = aliased(User)
+    return (db.select(Ticket.id, Ticket.title, Ticket.description, Ticket.status, Ticket.priority,
+                      reporter.username.label('reporter'), assignee.username.label('assignee'),
+                      Ticket.equipment_id, Ticket.created_at, Ticket.updated_at, Ticket.resolved_at)
+            .join(reporter, reporter.id == Ticket.reporter_id)
+            .outerjoin(assignee, assignee.id == Ticket.assignee_id)
+            .where(*visibility, *filters.conditions())
+            .order_by(Ticket.id))
+
+
+def _comment_query(filters, visibility):
+    return (db.select(Comment.id, Comment.ticket_id, User.username.label('author'),
+                      Comment.created_at, Comment.body)
+            .join(Ticket, Ticket.id == Comment.ticket_id)
+            .join(User, User.id == Comment.user_id)
+            .where(*visibility, *filters.conditions())
+            .order_by(Comment.id))
+
+
+def export_rows(dataset, filters, visibility=()):
+    """Column names and a lazy iterator over the matching rows of `dataset`."""
+    stmt = _ticket_query(filters, visibility) if dataset == 'tickets' else _comment_query(filters, visibility)
+    result = db.session.execute(stmt.execution_options(yield_per=ROWS_PER_FETCH))
+    return list(result.keys()), result
+
+
+def _plain(value):
+    return value.isoformat() if isinstance(value, (datetime, date)) else value
+
+
+def encode_csv(columns, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for i, row in enumerate(rows, start=1):
+        writer.writerow([_plain(v) for v in row])
+        if i % ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def encode_jsonl(columns, rows):
+    lines = []
+    for row in rows:
+        lines.append(json.dumps({c: _plain(v) for c, v in zip(columns, row)}))
+        if len(lines) == ROWS_PER_CHUNK:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def gzip_chunks(chunks):
+    """Gzip a stream of text chunks on the fly."""
+    compressor = zlib.compressobj(wbits=31) # 31 = gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(dataset, fmt, filters, visibility=(), compress=False):
+    """Generator of output chunks (str, or bytes when compressed)."""
+    columns, rows = export_rows(dataset, filters, visibility)
+    chunks = encode_csv(columns, rows) if fmt == 'csv' else encode_jsonl(columns, rows)
+    return gzip_chunks(chunks) if compress else chunks
+
+
+def export_filename(dataset, fmt, compress=False):
+    return f"{dataset}.{fmt}" + ('.gz' if compress else '')
@@ -0,0 +1,145 @@
+from datetime import datetime, timedelta
+from sqlalchemy.orm import aliased
+from app import db
+from app.models import Ticket, User, Equipment
+from .forms import STATUS_CHOICES, PRIORITY_CHOICES
+
+# Query-string value meaning "no assignee" / "no equipment"
+NONE_VALUE = 'none'
+
+FACETS = ('status', 'priority', 'assignee_id', 'equipment_id')
+
+
+class TicketFilters:
+    """
+    Ticket list filters parsed from the query string:
+    ?status=Open&priority=Urgent&assignee_id=none&equipment_id=3&created_from=2025-01-01&created_to=2025-01-31
+    Unknown or malformed values are ignored rather than rejected.
+    """
+    def __init__(self, status=None, priority=None, assignee_id=None, equipment_id=None,
+                 created_from=None, created_to=None):
+        self.status = status
+        self.priority = priority
+        self.assignee_id = assignee_id
+        self.equipment_id = equipment_id
+        self.created_from = created_from
+        self.created_to = created_to
+
+    @classmethod
+    def from_args(cls, args):
+        return cls(status=_choice(args.get('status'), STATUS_CHOICES),
+                   priority=_choice(args.get('priority'), PRIORITY_CHOICES),
+                   assignee_id=_id_or_none(args.get('assignee_id')),
+                   equipment_id=_id_or_none(args.get('equipment_id')),
+                   created_from=_date(args.get('created_from')),
+                   created_to=_date(args.get('created_to')))
+
+    @property
+    def active(self):
+        return any(v is not None for v in self.to_args().values())
+
+    def conditions(self, exclude=None):
+        """SQL conditions for every active filter, optionally leaving out one facet."""
+        conditions = []
+        if self.status and exclude != 'status':
+            conditions.append(Ticket.status == self.status)
+        if self.priority and exclude != 'priority':
+            conditions.append(Ticket.priority == self.priority)
+        if self.assignee_id is not None and exclude != 'assignee_id':
+            conditions.append(Ticket.assignee_id.is_(None) if self.assignee_id == NONE_VALUE
+                              else Ticket.assignee_id == self.assignee_id)
+        if self.equipment_id is not None and exclude != 'equipment_id':
+            conditions.append(Ticket.equipment_id.is_(None) if self.equipment_id == NONE_VALUE
+                              else Ticket.equipment_id == self.equipment_id)
+        if self.created_from:
+            conditions.append(Ticket.created_at >= datetime.combine(self.created_from, datetime.min.time()))
+        if self.created_to: # Inclusive of the whole end day
+            conditions.append(Ticket.created_at < datetime.combine(self.created_to + timedelta(days=1), datetime.min.time()))
+        return conditions
+
+    def apply(self, stmt):
+        return stmt.where(*self.conditions())
+
+    def to_args(self, **overrides):
+        """Query-string arguments for url_for(); pass facet=None to drop a filter."""
+        args = {
+            'status': self.status,
+            'priority': self.priority,
+            'assignee_id': self.assignee_id,
+            'equipment_id': self.equipment_id,
+            'created_from': self.created_from.isoformat() if self.created_from else None,
+            'created_to': self.created_to.isoformat() if self.created_to else None,
+        }
+        args.update(overrides)
+        return {k: v for k, v in args.items() if v is not None}
+
+    def is_selected(self, facet, value):
+        return str(getattr(self, facet)) == str(value)
+
+
+def facet_counts(filters, base_conditions=()):
+    """
+    Ticket counts per status, priority, assignee and equipment in ONE round trip
+    (a UNION ALL of grouped aggregates) instead of a COUNT per facet value.
+    Each facet is counted under all the other active filters but not its own,
+    so the sidebar keeps showing the alternatives for the selected facet.
+
+    Returns {facet: [(value, label, count), ...]}.
+    """
+    assignee = aliased(User)
+    equipment = aliased(Equipment)
+    value_type = db.String(120)
+
+    def branch(facet, value, label, *joins):
+        stmt = db.select(db.literal(facet, value_type).label('facet'),
+                         db.cast(value, value_type).label('value'),
+                         db.cast(label, value_type).label('label'),
+                         db.func.count(Ticket.id).label('count')).select_from(Ticket)
+        for target, onclause in joins:
+            stmt = stmt.outerjoin(target, onclause)
+        return (stmt.where(*base_conditions, *filters.conditions(exclude=facet))
+                .group_by(value, label))
+
+    stmt = db.union_all(
+        branch('status', Ticket.status, Ticket.status),
+        branch('priority', Ticket.priority, Ticket.priority),
+        branch('assignee_id', Ticket.assignee_id, assignee.username,
+               (assignee, assignee.id == Ticket.assignee_id)),
+        branch('equipment_id', Ticket.equipment_id, equipment.name,
+               (equipment, equipment.id == Ticket.equipment_id)),
+    )
+
+    facets = {facet: [] for facet in FACETS}
+    for row in db.session.execute(stmt):
+        if row.value is None:
+            facets[row.facet].append((NONE_VALUE, 'Unassigned' if row.facet == 'assignee_id' else 'None', row.count))
+        else:
+            facets[row.facet].append((row.value, row.label, row.count))
+
+    # Statuses and priorities keep their natural order; people and equipment sort by volume
+    for facet, choices in (('status', STATUS_CHOICES), ('priority', PRIORITY_CHOICES)):
+        order = [value for value, _ in choices]
+        facets[facet].sort(key=lambda item: order.index(item[0]) if item[0] in order else len(order))
+    for facet in ('assignee_id', 'equipment_id'):
+        facets[facet].sort(key=lambda item: (-item[2], item[1]))
+    return facets
+
+
+def _choice(value, choices):
+    return value if value in dict(choices) else None
+
+
+def _id_or_none(value):
+    if value == NONE_VALUE:
+        return NONE_VALUE
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+    except ValueError:
+        return None
@@ -1,7 +1,7 @@
 from flask_wtf import FlaskForm
 from wtforms import StringField, TextAreaField, SelectField, SubmitField
 from wtforms.validators import DataRequired, Length, Optional
-from app.models import User, Equipment # To populate assignee and equipment choices
+from app.choices import equipment_choices, assignee_choices, LookupSelect # Cached assignee and equipment choices
 
 # Choices for ticket status and priority
 STATUS_CHOICES = [('Open', 'Open'), ('In Progress', 'In Progress'), ('Resolved', 'Resolved'), ('Closed', 'Closed')]
@@ -11,7 +11,8 @@ class TicketForm(FlaskForm):
     title = StringField('Title', validators=[DataRequired(), Length(max=120)])
     description = TextAreaField('Description', validators=[DataRequired()])
     priority = SelectField('Priority', choices=PRIORITY_CHOICES, default='Medium', validators=[DataRequired()])
-    equipment_id = SelectField('Associated Equipment (Optional)', coerce=int, validators=[Optional()])
+    equipment_id = SelectField('Associated Equipment (Optional)', coerce=int, validators=[Optional()],
+                               widget=LookupSelect('tickets.lookup_equipment'))
     submit = SubmitField('Create Ticket')
 
     def __init__(self, *args, **kwargs):
@@ -19,32 +20,25 @@ class TicketForm(FlaskForm):
         # Populate equipment choices. (0, 'None') allows not selecting any.
         # Show only 'In Stock' or equipment already assigned to the current user (if applicable)
         # For simplicity now, show all non-retired. Can be refined.
-        self.equipment_id.choices = [(0, '--- None ---')] + \
-                                    [(e.id, f"{e.name} (S/N: {e.serial_number or 'N/A'})")
-                                     for e in Equipment.query.filter(Equipment.status != 'Retired')
-                                     .order_by(Equipment.name).all()]
+        self.equipment_id.choices = [(0, '--- None ---')] + equipment_choices()
 
 class UpdateTicketForm(FlaskForm):
     title = StringField('Title', validators=[DataRequired(), Length(max=120)])
     description = TextAreaField('Description', validators=[DataRequired()])
     priority = SelectField('Priority', choices=PRIORITY_CHOICES, validators=[DataRequired()])
     status = SelectField('Status', choices=STATUS_CHOICES, validators=[DataRequired()])
-    assignee_id = SelectField('Assign To', coerce=int, validators=[Optional()])
-    equipment_id = SelectField('Associated Equipment (Optional)', coerce=int, validators=[Optional()])
+    assignee_id = SelectField('Assign To', coerce=int, validators=[Optional()],
+                              widget=LookupSelect('tickets.lookup_assignees'))
+    equipment_id = SelectField('Associated Equipment (Optional)', coerce=int, validators=[Optional()],
+                               widget=LookupSelect('tickets.lookup_equipment'))
     submit = SubmitField('Update Ticket')
 
     def __init__(self, *args, **kwargs):
         super(UpdateTicketForm, self).__init__(*args, **kwargs)
         # Populate assignee choices
-        self.assignee_id.choices = [(0, '--- Unassign ---')] + \
-                                   [(user.id, user.username) for user in User.query
-                                    .filter(User.role.in_(['it_support', 'admin']))
-                                    .order_by(User.username).all()]
+        self.assignee_id.choices = [(0, '--- Unassign ---')] + assignee_choices()
         # Populate equipment choices
-        self.equipment_id.choices = [(0, '--- None ---')] + \
-                                    [(e.id, f"{e.name} (S/N: {e.serial_number or 'N/A'})")
-                                     for e in Equipment.query.filter(Equipment.status != 'Retired')
-                                     .order_by(Equipment.name).all()]
+        self.equipment_id.choices = [(0, '--- None ---')] + equipment_choices()
 
         # Set default for assignee_id if it's not provided (e.g. when form is created for an unassigned ticket)
         # The `obj=ticket` in routes.py usually handles populating fields from the model object.
@@ -0,0 +1,199 @@
+import csv
+import json
+import os
+from datetime import datetime, timezone
+from itertools import islice
+from sqlalchemy import insert
+from app import db
+from app.models import Ticket, Comment, User, Equipment
+from .forms import STATUS_CHOICES, PRIORITY_CHOICES
+
+# Bulk import of historical tickets, e.g. from a previous helpdesk.
+#
+# Input is streamed one record at a time (CSV or JSON Lines) and written in
+# batches through ORM bulk INSERT, so memory stays flat however large the file is.
+# After each committed batch the number of records consumed is written to a
+# checkpoint file; a re-run with the same checkpoint skips straight past them.
+#
+# Record fields: title, description, status, priority, reporter (username),
+# assignee (username), equipment_id, created_at, updated_at, resolved_at (ISO 8601).
+# JSONL records may also carry "comments": [{"author", "body", "created_at"}, ...].
+
+_STATUSES = {value for value, _ in STATUS_CHOICES}
+_PRIORITIES = {value for value, _ in PRIORITY_CHOICES}
+
+
+class RecordError(ValueError):
+    """A single record that cannot be imported; the rest of the batch carries on."""
+
+
+class ImportStats:
+    def __init__(self):
+        self.tickets = 0
+        self.comments = 0
+        self.skipped = 0
+        self.resumed_from = 0
+
+
+class Checkpoint:
+    """Progress marker for one input file, written atomically after every batch."""
+    def __init__(self, path, source):
+        self.path = path
+        self.source = os.path.abspath(source)
+
+    def load(self):
+        """Number of records already imported from this source (0 without a checkpoint)."""
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path) as f:
+            state = json.load(f)
+        if state.get('source') != self.source:
+            raise ValueError(f"Checkpoint {self.path} belongs to {state.get('source')}, not {self.source}")
+        return state['records']
+
+    def save(self, records):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'source': self.source, 'records': records}, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def detect_format(path):
+    return 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+
+def read_records(path, fmt):
+    """Yield one dict per input record, without reading the whole file."""
+    with open(path, newline='', encoding='utf-8') as f:
+        if fmt == 'csv':
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _timestamp(value, field):
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise RecordError(f"invalid {field} {value!r}")
+    # Stored like the rest of the app: UTC, timezone-aware
+    return parsed.astimezone(timezone.utc) if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _user_id(usernames, value, field, required=False):
+    if not value:
+        if required:
+            raise RecordError(f"missing {field}")
+        return None
+    try:
+        return usernames[value]
+    except KeyError:
+        raise RecordError(f"unknown {field} {value!r}")
+
+
+def _ticket_row(record, usernames, equipment_ids):
+    title = (record.get('title') or '').strip()
+    if not title:
+        raise RecordError("missing title")
+    status = record.get('status') or 'Open'
+    if status not in _STATUSES:
+        raise RecordError(f"invalid status {status!r}")
+    priority = record.get('priority') or 'Medium'
+    if priority not in _PRIORITIES:
+        raise RecordError(f"invalid priority {priority!r}")
+    try:
+        equipment_id = int(record['equipment_id']) if record.get('equipment_id') else None
+    except (TypeError, ValueError):
+        raise RecordError(f"invalid equipment_id {record.get('equipment_id')!r}")
+    if equipment_id is not None and equipment_id not in equipment_ids:
+        raise RecordError(f"unknown equipment_id {equipment_id}") # Would fail the whole batch with foreign_keys on
+
+    created_at = _timestamp(record.get('created_at'), 'created_at') or datetime.now(timezone.utc)
+    # Every row carries the same keys so the batch goes out as one executemany
+    return {
+        'title': title[:120],
+        'description': record.get('description') or '',
+        'status': status,
+        'priority': priority,
+        'reporter_id': _user_id(usernames, record.get('reporter'), 'reporter', required=True),
+        'assignee_id': _user_id(usernames, record.get('assignee'), 'assignee'),
+        'equipment_id': equipment_id,
+        'created_at': created_at,
+        'updated_at': _timestamp(record.get('updated_at'), 'updated_at') or created_at,
+        'resolved_at': _timestamp(record.get('resolved_at'), 'resolved_at'),
+    }
+
+
+def _comment_rows(record, usernames, default_time):
+    rows = []
+    for comment in record.get('comments') or []:
+        if not comment.get('body'):
+            raise RecordError("comment without body")
+        rows.append({
+            'body': comment['body'],
+            'user_id': _user_id(usernames, comment.get('author'), 'comment author', required=True),
+            'created_at': _timestamp(comment.get('created_at'), 'comment created_at') or default_time,
+        })
+    return rows
+
+
+def _write_batch(batch, stats):
+    # render_nulls keeps rows with different NULL columns in the same executemany
+    ticket_ids = db.session.scalars(
+        insert(Ticket).returning(Ticket.id, sort_by_parameter_order=True).execution_options(render_nulls=True),
+        [ticket for ticket, _ in batch]).all()
+    comments = [dict(comment, ticket_id=ticket_id)
+                for ticket_id, (_, ticket_comments) in zip(ticket_ids, batch)
+                for comment in ticket_comments]
+    if comments:
+        db.session.execute(insert(Comment), comments)
+    db.session.commit()
+    stats.tickets += len(ticket_ids)
+    stats.comments += len(comments)
+
+
+def import_tickets(records, batch_size=1000, checkpoint=None, on_error=None):
+    """
+    Import ticket records in batches of `batch_size`, committing each batch.
+
+    :param records: Iterable of record dicts, e.g. from read_records().
+    :param checkpoint: Optional Checkpoint; records it covers are skipped, and it is
+                       advanced after every batch and removed once the import completes.
+    :param on_error: Called as on_error(record_number, message) for each skipped record.
+    """
+    stats = ImportStats()
+    stats.resumed_from = position = checkpoint.load() if checkpoint else 0
+    records = islice(records, position, None)
+
+    # One query each for every user and equipment reference in the file
+    usernames = dict(db.session.execute(db.select(User.username, User.id)).all())
+    equipment_ids = set(db.session.scalars(db.select(Equipment.id)))
+
+    batch = []
+    for position, record in enumerate(records, start=position + 1):
+        try:
+            ticket = _ticket_row(record, usernames, equipment_ids)
+            batch.append((ticket, _comment_rows(record, usernames, ticket['created_at'])))
+        except RecordError as e:
+            stats.skipped += 1
+            if on_error:
+                on_error(position, str(e))
+        if len(batch) >= batch_size:
+            _write_batch(batch, stats)
+            batch = []
+            if checkpoint:
+                checkpoint.save(position)
+
+    if batch:
+        _write_batch(batch, stats)
+    if checkpoint:
+        checkpoint.clear()
+    return stats
@@ -0,0 +1,186 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+# Live ticket events for the Server-Sent Events stream (/tickets/stream).
+#
+# create_ticket, update_ticket and add_comment publish an event after they commit.
+# Events are appended to a small SQLite file (LIVE_EVENTS_DB) that every worker
+# process shares; one poller thread per process reads new rows and fans them out to
+# that process's subscribers. Each subscriber (an open stream) has a bounded queue:
+# a slow client loses its oldest events rather than growing without limit, and is
+# told to resync. Setting LIVE_EVENTS_DB to None keeps events within the process.
+
+BUS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS live_event (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    payload TEXT NOT NULL
+)
+"""
+
+
+class Subscriber:
+    """One open stream: a bounded queue that drops its oldest events when full."""
+    def __init__(self, maxsize, accepts=None):
+        self.events = deque(maxlen=maxsize)
+        self.dropped = 0
+        self.accepts = accepts or (lambda event: True)
+        self._ready = threading.Condition()
+
+    def put(self, event):
+        if not self.accepts(event):
+            return
+        with self._ready:
+            if len(self.events) == self.events.maxlen:
+                self.dropped += 1 # deque(maxlen) discards from the left on append
+            self.events.append(event)
+            self._ready.notify()
+
+    def get(self, timeout):
+        """Next event, or None after `timeout` seconds without one."""
+        with self._ready:
+            if not self.events:
+                self._ready.wait(timeout)
+            return self.events.popleft() if self.events else None
+
+    def take_dropped(self):
+        with self._ready:
+            dropped, self.dropped = self.dropped, 0
+            return dropped
+
+
+class Hub:
+    def __init__(self, bus_path=None, queue_size=100, poll_interval=0.5, retention=3600):
+        self.bus_path = bus_path
+        self.queue_size = queue_size
+        self.poll_interval = poll_interval
+        self.retention = retention
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._last_id = 0
+        self._poller = None
+        self._stopping = threading.Event()
+        if bus_path:
+            with self._connect() as conn:
+                conn.execute(BUS_SCHEMA)
+                self._last_id = conn.execute("SELECT coalesce(max(id), 0) FROM live_event").fetchone()[0]
+
+    def _connect(self):
+        conn = sqlite3.connect(self.bus_path, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL") # Writers from other workers don't block the pollers
+        return conn
+
+    def publish(self, event):
+        if not self.bus_path:
+            self._fan_out(event)
+            return
+        with self._connect() as conn:
+            conn.execute("INSERT INTO live_event (created_at, payload) VALUES (?, ?)",
+                         (time.time(), json.dumps(event)))
+
+    def _fan_out(self, event):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.put(event)
+
+    def replay(self, after_id, limit=None):
+        """Events on the bus after `after_id`, oldest first (for Last-Event-ID reconnects)."""
+        if not self.bus_path:
+            return []
+        with self._connect() as conn:
+            rows = conn.execute("SELECT id, payload FROM live_event WHERE id > ? ORDER BY id LIMIT ?",
+                                (after_id, limit or self.queue_size)).fetchall()
+        return [dict(json.loads(payload), id=row_id) for row_id, payload in rows]
+
+    def poll_once(self):
+        """Deliver bus events published since the last poll to local subscribers."""
+        events = self.replay(self._last_id, limit=1000)
+        for event in events:
+            self._fan_out(event)
+        if events:
+            self._last_id = events[-1]['id']
+        return len(events)
+
+    def prune(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM live_event WHERE created_at < ?", (time.time() - self.retention,))
+
+    def _run_poller(self):
+        polls = 0
+        while not self._stopping.wait(self.poll_interval):
+            try:
+                self.poll_once()
+                polls += 1
+                if polls % 1000 == 0:
+                    self.prune()
+            except sqlite3.Error as e:
+                logger.warning("Live event bus poll failed: %s", e)
+                time.sleep(self.poll_interval)
+
+    def subscribe(self, accepts=None):
+        subscriber = Subscriber(self.queue_size, accepts)
+        with self._lock:
+            self._subscribers.add(subscriber)
+            if self.bus_path and self._poller is None:
+                self._poller = threading.Thread(target=self._run_poller, name='live-event-poller', daemon=True)
+                self._poller.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def stop(self):
+        self._stopping.set()
+
+
+def init_app(app):
+    app.extensions['live_events'] = Hub(bus_path=app.config['LIVE_EVENTS_DB'],
+                                        queue_size=app.config['LIVE_QUEUE_SIZE'],
+                                        poll_interval=app.config['LIVE_POLL_INTERVAL'])
+
+
+def hub():
+    return current_app.extensions['live_events']
+
+
+def ticket_event(kind, ticket, **extra):
+    return dict({
+        'type': kind, # 'created', 'updated' or 'commented'
+        'ticket_id': ticket.id,
+        'title': ticket.title,
+        'status': ticket.status,
+        'priority': ticket.priority,
+        'reporter_id': ticket.reporter_id,
+        'assignee_id': ticket.assignee_id,
+        'at': time.time(),
+    }, **extra)
+
+
+def publish_ticket_event(kind, ticket, **extra):
+    """Publish a ticket change; call after the change is committed."""
+    hub().publish(ticket_event(kind, ticket, **extra))
+
+
+def visible_to(user_id, role):
+    """Event filter matching the ticket list's visibility rules."""
+    if role in ('it_support', 'admin'):
+        return lambda event: True
+    return lambda event: user_id in (event.get('reporter_id'), event.get('assignee_id'))
+
+
+def format_sse(event):
+    lines = []
+    if 'id' in event:
+        lines.append(f"id: {event['id']}")
+    lines.append(f"event: {event['type']}")
+    lines.append(f"data: {json.dumps(event)}")
+    return '\n'.join(lines) + '\n\n'
@@ -1,25 +1,131 @@
-from flask import render_template, redirect, url_for, flash, request, abort
+from flask import render_template, redirect, url_for, flash, request, abort, current_app, jsonify, Response, stream_with_context
 from flask_login import current_user, login_required
 from .forms import TicketForm, UpdateTicketForm, CommentForm
 from app.models import Ticket, User, Equipment, Comment
 from app import db
+from app.pagination import encode_cursor, keyset_paginate
+from app.decorators import it_support_required
+from app.query_counter import query_budget
+from app.db_routing import read_only
+from app.conditional import conditional_get
+from .search import search_tickets
+from .filters import TicketFilters, facet_counts
+from . import export, live
+from sqlalchemy.orm import joinedload
 from . import bp
 from datetime import datetime, timezone
 
 @bp.route('/')
+@read_only
+@query_budget(3)
 @login_required
 def list_tickets():
     list_title = "My Reported Tickets"
+    visibility = []
     if current_user.role in ['it_support', 'admin']:
-        tickets = Ticket.query.order_by(Ticket.created_at.desc()).all()
         list_title = "All Tickets"
     else:
-        tickets = Ticket.query.filter_by(reporter_id=current_user.id).order_by(Ticket.created_at.desc()).all()
+        visibility.append(Ticket.reporter_id == current_user.id)
 
     # A separate view for "Assigned to me" could be:
-    # assigned_tickets = Ticket.query.filter_by(assignee_id=current_user.id).order_by(Ticket.created_at.desc()).all()
+    # visibility.append(Ticket.assignee_id == current_user.id)
 
-    return render_template('tickets/list_tickets.html', tickets=tickets, list_title=list_title, title="Tickets")
+    filters = TicketFilters.from_args(request.args)
+    # Reporter and assignee usernames are shown on every row; join them into the page query
+    stmt = filters.apply(db.select(Ticket).where(*visibility)) \
+        .options(joinedload(Ticket.reporter), joinedload(Ticket.assignee))
+
+    # Keyset pagination on (created_at, id) so deep pages cost the same as the first one
+    page = keyset_paginate(stmt, (Ticket.created_at, Ticket.id),
+                           after=request.args.get('after'),
+                           before=request.args.get('before'),
+                           per_page=current_app.config['TICKETS_PER_PAGE'])
+    facets = facet_counts(filters, visibility)
+
+    return render_template('tickets/list_tickets.html', tickets=page.items, page=page,
+                           filters=filters, facets=facets,
+                           list_title=list_title, title="Tickets")
+
+@bp.route('/export')
+@login_required
+@it_support_required
+def export_tickets():
+    # Streams the filtered ticket list (same query-string filters as list_tickets)
+    fmt = request.args.get('format', 'csv')
+    dataset = request.args.get('dataset', 'tickets')
+    if fmt not in export.FORMATS or dataset not in export.DATASETS:
+        abort(400)
+    compress = request.args.get('gzip') == '1'
+
+    chunks = export.export_stream(dataset, fmt, TicketFilters.from_args(request.args), compress=compress)
+    filename = export.export_filename(dataset, fmt, compress)
+    return Response(stream_with_context(chunks),
+                    mimetype='application/gzip' if compress else export.FORMATS[fmt],
+                    headers={'Content-Disposition': f'attachment; filename="{filename}"'})
+
+@bp.route('/stream')
+@login_required
+def stream():
+    """Server-Sent Events feed of changes to the tickets the current user can see."""
+    hub = live.hub()
+    subscriber = hub.subscribe(live.visible_to(current_user.id, current_user.role))
+    # A reconnecting EventSource sends the last id it saw; replay what it missed from the bus
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    backlog = [e for e in hub.replay(last_event_id) if subscriber.accepts(e)] if last_event_id is not None else []
+    heartbeat = current_app.config['LIVE_HEARTBEAT_SECONDS']
+
+    def events():
+        sent_id = last_event_id or 0
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                event = backlog.pop(0) if backlog else subscriber.get(timeout=heartbeat)
+                dropped = subscriber.take_dropped()
+                if dropped: # The client fell behind; tell it to reload rather than trust a gappy feed
+                    yield live.format_sse({'type': 'resync', 'dropped': dropped})
+                if event is None:
+                    yield ': keepalive\n\n'
+                elif event.get('id', sent_id + 1) > sent_id: # Skip events both replayed and queued
+                    sent_id = event.get('id', sent_id)
+                    yield live.format_sse(event)
+        finally:
+            hub.unsubscribe(subscriber)
+
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@bp.route('/search')
+@login_required
+def search():
+    query = request.args.get('q', '').strip()
+    hits = search_tickets(query, current_user) if query else []
+    return render_template('tickets/search.html', query=query, hits=hits, title="Search Tickets")
+
+# Type-ahead lookups behind the LookupSelect widget; prefix match, capped result size
+LOOKUP_LIMIT = 20
+
+@bp.route('/lookup/equipment')
+@login_required
+def lookup_equipment():
+    term = request.args.get('q', '').strip()
+    rows = db.session.execute(
+        db.select(Equipment.id, Equipment.name, Equipment.serial_number)
+        .filter(Equipment.status != 'Retired',
+                db.or_(Equipment.name.startswith(term, autoescape=True),
+                       Equipment.serial_number.startswith(term, autoescape=True)))
+        .order_by(Equipment.name).limit(LOOKUP_LIMIT))
+    return jsonify([{'id': r.id, 'text': f"{r.name} (S/N: {r.serial_number or 'N/A'})"} for r in rows])
+
+@bp.route('/lookup/assignees')
+@login_required
+@it_support_required
+def lookup_assignees():
+    term = request.args.get('q', '').strip()
+    rows = db.session.execute(
+        db.select(User.id, User.username)
+        .filter(User.role.in_(['it_support', 'admin']), User.username.startswith(term, autoescape=True))
+        .order_by(User.username).limit(LOOKUP_LIMIT))
+    return jsonify([{'id': r.id, 'text': r.username} for r in rows])
 
 @bp.route('/new', methods=['GET', 'POST'])
 @login_required
@@ -37,17 +143,38 @@ def create_ticket():
             ticket.equipment_id = None # Ensure it's None if '--- None ---' was selected
         db.session.add(ticket)
         db.session.commit()
+        live.publish_ticket_event('created', ticket)
         flash('Ticket created successfully!', 'success')
         return redirect(url_for('tickets.view_ticket', ticket_id=ticket.id))
     return render_template('tickets/create_ticket.html', title='New Ticket', form=form)
 
+def _can_view_ticket(ticket):
+    return current_user.role in ['it_support', 'admin'] or \
+        ticket.reporter_id == current_user.id or \
+        (ticket.assignee_id and ticket.assignee_id == current_user.id)
+
+def _comment_page(ticket_id, after=None, before=None):
+    # Oldest first, one page at a time, authors joined in; seeks on ix_comment_ticket_id_created_at_id
+    stmt = db.select(Comment).where(Comment.ticket_id == ticket_id).options(joinedload(Comment.author))
+    return keyset_paginate(stmt, (Comment.created_at, Comment.id), after=after, before=before,
+                           per_page=current_app.config['COMMENTS_PER_PAGE'], descending=False)
+
+def _ticket_last_modified(ticket_id):
+    # add_comment and update_ticket both bump updated_at, so it covers the whole page
+    row = db.session.execute(db.select(Ticket.updated_at, Ticket.reporter_id, Ticket.assignee_id)
+                             .where(Ticket.id == ticket_id)).first()
+    return row.updated_at if row is not None and _can_view_ticket(row) else None
+
 @bp.route('/<int:ticket_id>', methods=['GET'])
+@read_only
+@query_budget(5)
 @login_required
+@conditional_get(_ticket_last_modified)
 def view_ticket(ticket_id):
-    ticket = Ticket.query.get_or_404(ticket_id)
-    if not (current_user.role in ['it_support', 'admin'] or \
-            ticket.reporter_id == current_user.id or \
-            (ticket.assignee_id and ticket.assignee_id == current_user.id)):
+    ticket = Ticket.query.options(joinedload(Ticket.reporter),
+                                  joinedload(Ticket.assignee),
+                                  joinedload(Ticket.associated_equipment)).get_or_404(ticket_id)
+    if not _can_view_ticket(ticket):
         flash('You do not have permission to view this ticket.', 'danger')
         return redirect(url_for('tickets.list_tickets'))
 
@@ -59,11 +186,28 @@ def view_ticket(ticket_id):
         if ticket.assignee_id is None and update_form.assignee_id.data is None:
              update_form.assignee_id.data = 0 # Represents "Unassign"
 
-    # Comments are loaded via relationship, ordered by model definition
-    return render_template('tickets/view_ticket.html', ticket=ticket,
+    # Only the first page of a long thread is rendered; "Load more" fetches the rest from ticket_comments
+    comments = _comment_page(ticket.id, after=request.args.get('comments_after'),
+                             before=request.args.get('comments_before'))
+    return render_template('tickets/view_ticket.html', ticket=ticket, comments=comments,
                            comment_form=comment_form, update_form=update_form,
                            title=f"Ticket #{ticket.id}")
 
+@bp.route('/<int:ticket_id>/comments', methods=['GET'])
+@read_only
+@query_budget(3)
+@login_required
+def ticket_comments(ticket_id):
+    """JSON fragment with the next page of a ticket's comments, for incremental loading."""
+    ticket = db.get_or_404(Ticket, ticket_id)
+    if not _can_view_ticket(ticket):
+        abort(403)
+    comments = _comment_page(ticket.id, after=request.args.get('after'))
+    return jsonify(html=render_template('tickets/_comments.html', comments=comments),
+                   next_cursor=comments.next_cursor,
+                   next_url=url_for('tickets.ticket_comments', ticket_id=ticket.id, after=comments.next_cursor)
+                   if comments.next_cursor else None)
+
 @bp.route('/<int:ticket_id>/update', methods=['POST']) # Should only be POST from view_ticket's embedded form
 @login_required
 def update_ticket(ticket_id):
@@ -100,6 +244,7 @@ def update_ticket(ticket_id):
 
         ticket.updated_at = datetime.now(timezone.utc)
         db.session.commit()
+        live.publish_ticket_event('updated', ticket)
         flash('Ticket updated successfully!', 'success')
     else:
         # Form validation failed, collect errors and flash them
@@ -113,10 +258,7 @@ def update_ticket(ticket_id):
 @login_required
 def add_comment(ticket_id):
     ticket = Ticket.query.get_or_404(ticket_id)
-    # Permission check similar to view_ticket might be good
-    if not (current_user.role in ['it_support', 'admin'] or \
-            ticket.reporter_id == current_user.id or \
-            (ticket.assignee_id and ticket.assignee_id == current_user.id)):
+    if not _can_view_ticket(ticket):
         flash('You do not have permission to comment on this ticket.', 'danger')
         return redirect(url_for('tickets.list_tickets'))
 
@@ -128,7 +270,15 @@ def add_comment(ticket_id):
         db.session.add(comment)
         ticket.updated_at = datetime.now(timezone.utc) # Adding a comment updates the ticket
         db.session.commit()
+        live.publish_ticket_event('commented', ticket, author_id=current_user.id)
         flash('Comment added.', 'success')
+        # On a thread longer than one page, open the page that starts with the new comment
+        earlier = db.session.scalar(db.select(db.func.count()).select_from(Comment)
+                                    .where(Comment.ticket_id == ticket.id, Comment.id != comment.id))
+        if earlier >= current_app.config['COMMENTS_PER_PAGE']:
+            return redirect(url_for('tickets.view_ticket', ticket_id=ticket.id,
+                                    comments_after=encode_cursor((comment.created_at, comment.id - 1)),
+                                    _anchor=f"comment-{comment.id}"))
     else:
         for field, errors in form.errors.items():
             for error in errors:
@@ -0,0 +1,159 @@
+import re
+from collections import namedtuple
+from markupsafe import Markup, escape
+from sqlalchemy import event, text
+from sqlalchemy.orm import joinedload
+from app import db
+from app.models import Ticket
+
+# Full-text index over ticket titles/descriptions and comment bodies (SQLite FTS5).
+# Every document gets a deterministic rowid -- ticket N is 2N, comment N is 2N+1 --
+# so the sync triggers below update and delete index rows by rowid instead of
+# scanning the UNINDEXED ticket_id/comment_id columns.
+SEARCH_TABLE = 'ticket_search'
+
+SEARCH_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        title, body, ticket_id UNINDEXED, comment_id UNINDEXED, tokenize='porter unicode61'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ticket_ai AFTER INSERT ON ticket BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, title, body, ticket_id, comment_id)
+        VALUES (new.id * 2, new.title, new.description, new.id, NULL);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ticket_au AFTER UPDATE OF title, description ON ticket BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * 2;
+        INSERT INTO {SEARCH_TABLE}(rowid, title, body, ticket_id, comment_id)
+        VALUES (new.id * 2, new.title, new.description, new.id, NULL);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ticket_ad AFTER DELETE ON ticket BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * 2;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_comment_ai AFTER INSERT ON comment BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, title, body, ticket_id, comment_id)
+        VALUES (new.id * 2 + 1, '', new.body, new.ticket_id, new.id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_comment_au AFTER UPDATE OF body, ticket_id ON comment BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * 2 + 1;
+        INSERT INTO {SEARCH_TABLE}(rowid, title, body, ticket_id, comment_id)
+        VALUES (new.id * 2 + 1, '', new.body, new.ticket_id, new.id);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_comment_ad AFTER DELETE ON comment BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id * 2 + 1;
+    END""",
+]
+
+# Snippet highlight markers; control characters cannot appear in a tokenized match,
+# so they survive HTML escaping and are swapped for <mark> tags afterwards.
+_HIGHLIGHT_OPEN, _HIGHLIGHT_CLOSE = '\x02', '\x03'
+
+SearchHit = namedtuple('SearchHit', ['ticket', 'snippet', 'comment_id'])
+
+
+def is_supported(connection):
+    return connection.dialect.name == 'sqlite'
+
+
+def create_search_index(connection):
+    for statement in SEARCH_DDL:
+        connection.exec_driver_sql(statement)
+
+
+def rebuild_search_index(connection):
+    """Repopulate the index from the ticket and comment tables. Returns the number of documents indexed."""
+    create_search_index(connection)
+    connection.exec_driver_sql(f"DELETE FROM {SEARCH_TABLE}")
+    connection.exec_driver_sql(
+        f"""INSERT INTO {SEARCH_TABLE}(rowid, title, body, ticket_id, comment_id)
+            SELECT id * 2, title, description, id, NULL FROM ticket""")
+    connection.exec_driver_sql(
+        f"""INSERT INTO {SEARCH_TABLE}(rowid, title, body, ticket_id, comment_id)
+            SELECT id * 2 + 1, '', body, ticket_id, id FROM comment""")
+    connection.exec_driver_sql(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('optimize')")
+    return connection.exec_driver_sql(f"SELECT count(*) FROM {SEARCH_TABLE}").scalar()
+
+
+@event.listens_for(db.metadata, 'after_create')
+def _create_search_index(target, connection, **kw):
+    # Keeps db.create_all() (used by the tests) in step with the migration
+    if is_supported(connection):
+        create_search_index(connection)
+
+
+@event.listens_for(db.metadata, 'before_drop')
+def _drop_search_index(target, connection, **kw):
+    if is_supported(connection):
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+def build_match_query(terms):
+    """
+    Turn free text into a safe FTS5 query: every word is quoted (so operators and
+    punctuation in user input cannot cause syntax errors) and the last one is
+    treated as a prefix, which suits search-as-you-type.
+    Returns None when there is nothing searchable.
+    """
+    words = re.findall(r'\w+', terms or '', re.UNICODE)
+    if not words:
+        return None
+    quoted = ['"%s"' % word for word in words]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def _highlight(snippet):
+    escaped = str(escape(snippet))
+    return Markup(escaped.replace(_HIGHLIGHT_OPEN, '<mark>').replace(_HIGHLIGHT_CLOSE, '</mark>'))
+
+
+def search_tickets(terms, user, limit=20):
+    """
+    Ranked search over tickets visible to `user`. Title matches outweigh description
+    and comment matches. Returns a list of SearchHit, at most one per ticket.
+    """
+    match = build_match_query(terms)
+    if match is None:
+        return []
+
+    if not is_supported(db.session.connection()):
+        return _search_tickets_like(terms, user, limit)
+
+    visibility = ''
+    params = {'match': match, 'limit': limit * 3} # Several hits may belong to the same ticket
+    if user.role not in ['it_support', 'admin']:
+        visibility = 'AND (ticket.reporter_id = :user_id OR ticket.assignee_id = :user_id)'
+        params['user_id'] = user.id
+
+    rows = db.session.execute(text(f"""
+        SELECT {SEARCH_TABLE}.ticket_id AS ticket_id,
+               {SEARCH_TABLE}.comment_id AS comment_id,
+               snippet({SEARCH_TABLE}, -1, char(2), char(3), '…', 16) AS snippet,
+               bm25({SEARCH_TABLE}, 10.0, 1.0) AS score
+        FROM {SEARCH_TABLE}
+        JOIN ticket ON ticket.id = {SEARCH_TABLE}.ticket_id
+        WHERE {SEARCH_TABLE} MATCH :match {visibility}
+        ORDER BY score
+        LIMIT :limit
+    """), params).all()
+
+    best = {}
+    for row in rows:
+        if row.ticket_id not in best and len(best) < limit:
+            best[row.ticket_id] = row
+    if not best:
+        return []
+
+    tickets = {t.id: t for t in Ticket.query.options(joinedload(Ticket.reporter))
+               .filter(Ticket.id.in_(best.keys()))}
+    return [SearchHit(tickets[ticket_id], _highlight(row.snippet), row.comment_id)
+            for ticket_id, row in best.items() if ticket_id in tickets]
+
+
+def _search_tickets_like(terms, user, limit):
+    # Fallback for databases without FTS5; unranked and much slower on big tables
+    pattern = f"%{terms.strip()}%"
+    query = Ticket.query.options(joinedload(Ticket.reporter)).filter(
+        db.or_(Ticket.title.ilike(pattern), Ticket.description.ilike(pattern)))
+    if user.role not in ['it_support', 'admin']:
+        query = query.filter(db.or_(Ticket.reporter_id == user.id, Ticket.assignee_id == user.id))
+    return [SearchHit(t, escape(t.description[:200]), None)
+            for t in query.order_by(Ticket.created_at.desc()).limit(limit)]
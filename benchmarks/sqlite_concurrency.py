@@ -0,0 +1,106 @@
+"""
+Concurrent read/write throughput of the SQLite engine profiles.
+
+Starts several worker processes (standing in for gunicorn workers) against a
+scratch database. Each worker runs a mix of ticket list reads and ticket/comment
+writes for a fixed time, once per profile, and the totals are printed side by side:
+
+    python benchmarks/sqlite_concurrency.py --workers 8 --seconds 10 --write-ratio 0.2
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from app import create_app, db  # noqa: E402
+from app.models import User, Ticket, Comment  # noqa: E402
+
+
+def _app(path, profile):
+    return create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{path}",
+        'DB_ENGINE_PROFILE': profile,
+    })
+
+
+def setup_database(path, profile, tickets=2000):
+    app = _app(path, profile)
+    with app.app_context():
+        db.create_all()
+        user = User(username='bench', email='bench@example.com', role='it_support')
+        user.set_password('bench')
+        db.session.add(user)
+        db.session.flush()
+        db.session.add_all(Ticket(title=f"Ticket {i}", description="Benchmark", reporter_id=user.id)
+                           for i in range(tickets))
+        db.session.commit()
+        db.engine.dispose()
+
+
+def worker(path, profile, seconds, write_ratio, results):
+    app = _app(path, profile)
+    reads = writes = locked = 0
+    rng = random.Random(os.getpid())
+    with app.app_context():
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            try:
+                if rng.random() < write_ratio:
+                    ticket = Ticket(title="Concurrent write", description="Benchmark", reporter_id=1)
+                    db.session.add(ticket)
+                    db.session.flush()
+                    db.session.add(Comment(body="Benchmark comment", user_id=1, ticket_id=ticket.id))
+                    db.session.commit()
+                    writes += 1
+                else:
+                    db.session.scalars(db.select(Ticket).order_by(Ticket.created_at.desc(), Ticket.id.desc())
+                                       .limit(25)).all()
+                    db.session.commit()
+                    reads += 1
+            except OperationalError as e:
+                db.session.rollback()
+                if 'locked' not in str(e):
+                    raise
+                locked += 1
+        db.engine.dispose()
+    results.put((reads, writes, locked))
+
+
+def run(profile, workers, seconds, write_ratio):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'bench.db')
+        setup_database(path, profile)
+        results = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=worker, args=(path, profile, seconds, write_ratio, results))
+                     for _ in range(workers)]
+        for p in processes:
+            p.start()
+        totals = [sum(values) for values in zip(*(results.get() for _ in processes))]
+        for p in processes:
+            p.join()
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    parser.add_argument('--profiles', nargs='+', default=['stock', 'tuned'])
+    args = parser.parse_args()
+
+    print(f"{args.workers} workers, {args.seconds:g}s, {args.write_ratio:.0%} writes")
+    print(f"{'profile':<8} {'reads/s':>10} {'writes/s':>10} {'locked':>8}")
+    for profile in args.profiles:
+        reads, writes, locked = run(profile, args.workers, args.seconds, args.write_ratio)
+        print(f"{profile:<8} {reads / args.seconds:>10.0f} {writes / args.seconds:>10.0f} {locked:>8}")
+
+
+if __name__ == '__main__':
+    main()
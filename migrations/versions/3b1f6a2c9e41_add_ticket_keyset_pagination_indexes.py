@@ -0,0 +1,28 @@
+"""Add composite indexes for keyset pagination of tickets
+
+Revision ID: 3b1f6a2c9e41
+Revises: d4c86cb9b39a
+Create Date: 2025-07-08 10:12:31.204117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b1f6a2c9e41'
+down_revision = 'd4c86cb9b39a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('ticket', schema=None) as batch_op:
+        batch_op.create_index('ix_ticket_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_ticket_reporter_id_created_at_id', ['reporter_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('ticket', schema=None) as batch_op:
+        batch_op.drop_index('ix_ticket_reporter_id_created_at_id')
+        batch_op.drop_index('ix_ticket_created_at_id')
@@ -0,0 +1,68 @@
+"""Add FTS5 full-text search index over tickets and comments
+
+Revision ID: 7c2d41e8a0f3
+Revises: 3b1f6a2c9e41
+Create Date: 2025-07-09 14:03:52.771905
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2d41e8a0f3'
+down_revision = '3b1f6a2c9e41'
+branch_labels = None
+depends_on = None
+
+
+# Ticket N is indexed as rowid 2N and comment N as rowid 2N+1 (see app/tickets/search.py)
+STATEMENTS = [
+    """CREATE VIRTUAL TABLE ticket_search USING fts5(
+        title, body, ticket_id UNINDEXED, comment_id UNINDEXED, tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER ticket_search_ticket_ai AFTER INSERT ON ticket BEGIN
+        INSERT INTO ticket_search(rowid, title, body, ticket_id, comment_id)
+        VALUES (new.id * 2, new.title, new.description, new.id, NULL);
+    END""",
+    """CREATE TRIGGER ticket_search_ticket_au AFTER UPDATE OF title, description ON ticket BEGIN
+        DELETE FROM ticket_search WHERE rowid = old.id * 2;
+        INSERT INTO ticket_search(rowid, title, body, ticket_id, comment_id)
+        VALUES (new.id * 2, new.title, new.description, new.id, NULL);
+    END""",
+    """CREATE TRIGGER ticket_search_ticket_ad AFTER DELETE ON ticket BEGIN
+        DELETE FROM ticket_search WHERE rowid = old.id * 2;
+    END""",
+    """CREATE TRIGGER ticket_search_comment_ai AFTER INSERT ON comment BEGIN
+        INSERT INTO ticket_search(rowid, title, body, ticket_id, comment_id)
+        VALUES (new.id * 2 + 1, '', new.body, new.ticket_id, new.id);
+    END""",
+    """CREATE TRIGGER ticket_search_comment_au AFTER UPDATE OF body, ticket_id ON comment BEGIN
+        DELETE FROM ticket_search WHERE rowid = old.id * 2 + 1;
+        INSERT INTO ticket_search(rowid, title, body, ticket_id, comment_id)
+        VALUES (new.id * 2 + 1, '', new.body, new.ticket_id, new.id);
+    END""",
+    """CREATE TRIGGER ticket_search_comment_ad AFTER DELETE ON comment BEGIN
+        DELETE FROM ticket_search WHERE rowid = old.id * 2 + 1;
+    END""",
+    """INSERT INTO ticket_search(rowid, title, body, ticket_id, comment_id)
+       SELECT id * 2, title, description, id, NULL FROM ticket""",
+    """INSERT INTO ticket_search(rowid, title, body, ticket_id, comment_id)
+       SELECT id * 2 + 1, '', body, ticket_id, id FROM comment""",
+]
+
+
+def upgrade():
+    # FTS5 is SQLite-only; other databases fall back to LIKE search in the app
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for statement in STATEMENTS:
+        op.execute(statement)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    for trigger in ['ticket_ai', 'ticket_au', 'ticket_ad', 'comment_ai', 'comment_au', 'comment_ad']:
+        op.execute(f"DROP TRIGGER IF EXISTS ticket_search_{trigger}")
+    op.execute("DROP TABLE IF EXISTS ticket_search")
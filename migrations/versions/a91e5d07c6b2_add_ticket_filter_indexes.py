@@ -0,0 +1,30 @@
+"""Add composite indexes for ticket list filters and facet counts
+
+Revision ID: a91e5d07c6b2
+Revises: 7c2d41e8a0f3
+Create Date: 2025-07-11 09:47:15.338210
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a91e5d07c6b2'
+down_revision = '7c2d41e8a0f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('ticket', schema=None) as batch_op:
+        batch_op.create_index('ix_ticket_status_priority_created_at', ['status', 'priority', 'created_at'], unique=False)
+        batch_op.create_index('ix_ticket_assignee_id_status_created_at', ['assignee_id', 'status', 'created_at'], unique=False)
+        batch_op.create_index('ix_ticket_equipment_id_created_at', ['equipment_id', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('ticket', schema=None) as batch_op:
+        batch_op.drop_index('ix_ticket_equipment_id_created_at')
+        batch_op.drop_index('ix_ticket_assignee_id_status_created_at')
+        batch_op.drop_index('ix_ticket_status_priority_created_at')
@@ -0,0 +1,26 @@
+"""Add (ticket_id, created_at, id) index for paginated comment threads
+
+Revision ID: e3b8f61c2d94
+Revises: a91e5d07c6b2
+Create Date: 2025-07-14 10:12:41.902514
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3b8f61c2d94'
+down_revision = 'a91e5d07c6b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('comment', schema=None) as batch_op:
+        batch_op.create_index('ix_comment_ticket_id_created_at_id', ['ticket_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('comment', schema=None) as batch_op:
+        batch_op.drop_index('ix_comment_ticket_id_created_at_id')
@@ -0,0 +1,48 @@
+from app import db
+from app.bench.runner import compare, run_benchmarks
+from app.bench.seed import seed
+from app.models import User, Ticket, Comment, Equipment
+from tests.base import BaseTestCase
+
+
+class BenchTestCase(BaseTestCase):
+    def _seed(self):
+        return seed(users=6, staff=2, equipment=5, tickets=40, comments_per_ticket=2,
+                    long_thread_ratio=0.1, long_thread_length=15, batch_size=16)
+
+    def test_seed_creates_skewed_dataset(self):
+        stats = self._seed()
+        self.assertEqual((stats.users, stats.equipment, stats.tickets), (8, 5, 40))
+        self.assertEqual(db.session.scalar(db.select(db.func.count()).select_from(Comment)), stats.comments)
+        self.assertEqual(db.session.scalar(db.select(db.func.count()).select_from(User)
+                                           .where(User.role == 'it_support')), 2)
+        # Reporters follow a Zipf-like skew: the busiest one outnumbers an even share
+        busiest = db.session.execute(db.select(db.func.count()).select_from(Ticket)
+                                     .group_by(Ticket.reporter_id).order_by(db.func.count().desc())).scalars().first()
+        self.assertGreater(busiest, 40 / 6)
+        longest = db.session.execute(db.select(db.func.count()).select_from(Comment)
+                                     .group_by(Comment.ticket_id).order_by(db.func.count().desc())).scalars().first()
+        self.assertEqual(longest, 15)
+
+    def test_seed_twice_does_not_collide(self):
+        self._seed()
+        self._seed()
+        self.assertEqual(db.session.scalar(db.select(db.func.count()).select_from(Equipment)), 10)
+
+    def test_run_benchmarks(self):
+        self._seed()
+        results = run_benchmarks(self.app, requests=2, warmup=0)
+        self.assertIn('list_tickets/staff', results)
+        self.assertIn('view_ticket/long_thread', results)
+        for name, result in results.items():
+            self.assertEqual(result['status'], 200, name)
+            self.assertGreater(result['peak_kib'], 0)
+        self.assertLessEqual(results['list_tickets/staff']['queries'], 3)
+
+    def test_compare_flags_regressions(self):
+        baseline = {'view_ticket': {'p50_ms': 10, 'p90_ms': 20, 'p99_ms': 30, 'peak_kib': 100, 'queries': 2}}
+        same = {'view_ticket': dict(baseline['view_ticket'], p50_ms=11)}
+        self.assertEqual(compare(same, baseline, tolerance=0.2), [])
+        slower = {'view_ticket': dict(baseline['view_ticket'], p90_ms=30, queries=5)}
+        self.assertEqual(compare(slower, baseline, tolerance=0.2),
+                         [('view_ticket', 'p90_ms', 20, 30), ('view_ticket', 'queries', 2, 5)])
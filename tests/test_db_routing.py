@@ -0,0 +1,54 @@
+from flask import url_for
+from app import db
+from app.models import User, Ticket
+from tests.base import BaseTestCase
+
+
+class ReadReplicaRoutingTestCase(BaseTestCase):
+    app_config = {"READ_REPLICA_URIS": ["sqlite:///:memory:"], "READ_YOUR_WRITES_SECONDS": 60}
+
+    def setUp(self):
+        super().setUp()
+        self.replica = db.engines['replica_0']
+        db.metadata.create_all(self.replica)
+        self.user = self.register_user(username="replicauser", email="replica@example.com")
+        self.create_test_ticket(self.user.id, title="Only on the primary")
+        # The replica lags: it has the user but a different set of tickets
+        with self.replica.begin() as connection:
+            connection.execute(User.__table__.insert(), [{
+                'id': self.user.id, 'username': self.user.username, 'email': self.user.email,
+                'password_hash': self.user.password_hash, 'role': self.user.role}])
+            connection.execute(Ticket.__table__.insert(), [{
+                'title': "Only on the replica", 'description': "Lagging copy", 'status': 'Open',
+                'priority': 'Medium', 'reporter_id': self.user.id}])
+        self.login_user(username="replicauser")
+
+    def tearDown(self):
+        db.metadata.drop_all(self.replica)
+        super().tearDown()
+        db.metadatas.pop('replica_0', None) # Registered on the shared db object by init_app; later apps lack the bind
+
+    def test_read_only_view_uses_replica(self):
+        response = self.client.get(url_for('tickets.list_tickets'))
+        self.assertIn(b"Only on the replica", response.data)
+        self.assertNotIn(b"Only on the primary", response.data)
+
+    def test_undecorated_view_uses_primary(self):
+        response = self.client.get(url_for('tickets.search', q="primary"))
+        self.assertIn(b"Only on the primary", response.data)
+
+    def test_reads_pinned_to_primary_after_own_write(self):
+        self.client.post(url_for('tickets.create_ticket'),
+                         data={'title': "Just reported", 'description': "Printer on fire", 'priority': 'High',
+                               'equipment_id': 0})
+        response = self.client.get(url_for('tickets.list_tickets'))
+        self.assertIn(b"Just reported", response.data)
+        self.assertNotIn(b"Only on the replica", response.data)
+
+    def test_read_your_writes_window_expires(self):
+        self.app.config['READ_YOUR_WRITES_SECONDS'] = 0
+        self.client.post(url_for('tickets.create_ticket'),
+                         data={'title': "Just reported", 'description': "Printer on fire", 'priority': 'High',
+                               'equipment_id': 0})
+        response = self.client.get(url_for('tickets.list_tickets'))
+        self.assertIn(b"Only on the replica", response.data)
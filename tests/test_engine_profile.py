@@ -0,0 +1,66 @@
+import os
+import shutil
+import tempfile
+import unittest
+from flask import Flask
+from app import create_app, db
+from app import engine_profile
+
+
+class EngineProfileTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _pragmas(self, **config):
+        app = create_app(dict({
+            "TESTING": True,
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(self.tmpdir, 'bench.db')}",
+        }, **config))
+        with app.app_context():
+            connection = db.engine.raw_connection()
+            try:
+                return {name: connection.execute(f"PRAGMA {name}").fetchone()[0]
+                        for name in ('journal_mode', 'synchronous', 'busy_timeout', 'foreign_keys')}
+            finally:
+                connection.close()
+                db.engine.dispose()
+
+    def test_tuned_profile_applied_on_connect(self):
+        pragmas = self._pragmas()
+        self.assertEqual(pragmas['journal_mode'], 'wal')
+        self.assertEqual(pragmas['synchronous'], 1) # NORMAL
+        self.assertEqual(pragmas['busy_timeout'], 5000)
+        self.assertEqual(pragmas['foreign_keys'], 1)
+
+    def test_pragma_overrides(self):
+        pragmas = self._pragmas(SQLITE_PRAGMAS="busy_timeout=250")
+        self.assertEqual(pragmas['busy_timeout'], 250)
+
+    def test_stock_profile_leaves_defaults(self):
+        pragmas = self._pragmas(DB_ENGINE_PROFILE='stock')
+        self.assertEqual(pragmas['journal_mode'], 'delete')
+        self.assertEqual(pragmas['foreign_keys'], 0)
+
+    def test_memory_database_skips_wal(self):
+        pragmas = engine_profile.sqlite_pragmas({'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:'})
+        self.assertNotIn('journal_mode', pragmas)
+        self.assertEqual(pragmas['busy_timeout'], 5000)
+
+    def test_pool_options_for_server_databases(self):
+        app = Flask(__name__)
+        app.config.update(SQLALCHEMY_DATABASE_URI='postgresql://localhost/helpdesk',
+                          DB_POOL_SIZE=10, DB_MAX_OVERFLOW=5, DB_POOL_RECYCLE=1800, DB_POOL_PRE_PING=True)
+        engine_profile.configure(app)
+        self.assertEqual(app.config['SQLALCHEMY_ENGINE_OPTIONS'],
+                         {'pool_size': 10, 'max_overflow': 5, 'pool_recycle': 1800, 'pool_pre_ping': True})
+
+        app.config.update(SQLALCHEMY_DATABASE_URI='sqlite:///site.db', SQLALCHEMY_ENGINE_OPTIONS={})
+        engine_profile.configure(app)
+        self.assertEqual(app.config['SQLALCHEMY_ENGINE_OPTIONS'], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+from tests.base import BaseTestCase
+from app.models import User, Equipment
+from app import db
+from flask import url_for
+
+class TestInventoryRoutes(BaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.it_user = self.register_user(username="itsupport", email="it@test.com", password="password", role="it_support")
+        self.employee_user = self.register_user(username="employee", email="employee@test.com", password="password")
+
+    def test_list_equipment_query_count_is_constant(self):
+        for i in range(10):
+            db.session.add(Equipment(name=f'Laptop{i:02d}', type='Laptop', serial_number=f'SN{i:03d}',
+                                     status='Assigned' if i % 2 else 'In Stock',
+                                     assigned_to_user_id=self.employee_user.id if i % 2 else None))
+        db.session.commit()
+
+        self.login_user(username="itsupport", password="password")
+        with self.assertMaxQueries(2):
+            response = self.client.get(url_for('inventory.list_equipment'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'Laptop09', response.data)
+        self.assertIn(b'employee', response.data)
+
+    def test_view_equipment_lists_associated_tickets(self):
+        equipment = Equipment(name='Printer01', type='Printer', serial_number='PR001')
+        db.session.add(equipment)
+        db.session.commit()
+        for i in range(3):
+            ticket = self.create_test_ticket(user_id=self.employee_user.id, title=f'Paper jam {i}')
+            ticket.equipment_id = equipment.id
+        db.session.commit()
+
+        self.login_user(username="itsupport", password="password")
+        with self.assertMaxQueries(4):
+            response = self.client.get(url_for('inventory.view_equipment', equipment_id=equipment.id))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'Paper jam 2', response.data)
+
+    def test_view_equipment_conditional_get(self):
+        equipment = Equipment(name='Printer01', type='Printer', serial_number='PR001')
+        db.session.add(equipment)
+        db.session.commit()
+        ticket = self.create_test_ticket(user_id=self.employee_user.id, title='Paper jam')
+        ticket.equipment_id = equipment.id
+        db.session.commit()
+
+        self.login_user(username="itsupport", password="password")
+        url = url_for('inventory.view_equipment', equipment_id=equipment.id)
+        response = self.client.get(url)
+        etag = response.headers['ETag']
+        self.assertIsNotNone(response.last_modified)
+
+        with self.assertMaxQueries(1):
+            response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+        # A change to one of its tickets changes the page too
+        ticket.status = 'Resolved'
+        db.session.commit()
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_bulk_import_dedupes_serials_and_reports_rows(self):
+        import io
+        db.session.add(Equipment(name='Existing', type='Laptop', serial_number='DUP-DB'))
+        db.session.commit()
+        csv_data = (
+            "Name,Type,Serial Number,Purchase Date,Status\n"
+            "Laptop A,Laptop,SN-A,2025-01-10,\n"
+            "Laptop B,Laptop,DUP-DB,,\n"
+            "Laptop C,Laptop,SN-A,,\n"
+            "Mystery,Toaster,SN-X,,\n"
+            "Laptop D,Laptop,,01/02/2025,Retired\n"
+            "Monitor E,Monitor,SN-E,,In Repair\n"
+        )
+        self.login_user(username="itsupport", password="password")
+        with self.assertMaxQueries(3): # user, serial pre-fetch, one batched insert
+            response = self.client.post(url_for('inventory.import_equipment_csv'),
+                                        data={'file': (io.BytesIO(csv_data.encode('utf-8')), 'shipment.csv')},
+                                        content_type='multipart/form-data', follow_redirects=True)
+        self.assertIn(b'2 equipment items imported.', response.data)
+        self.assertIn(b'serial number DUP-DB already exists', response.data)
+        self.assertIn(b'serial number SN-A already appears on row 2', response.data)
+        self.assertIn(b'type must be one of', response.data)
+        self.assertIn(b'purchase_date must be YYYY-MM-DD', response.data)
+
+        self.assertEqual(Equipment.query.filter_by(serial_number='SN-A').one().name, 'Laptop A')
+        self.assertEqual(Equipment.query.filter_by(serial_number='SN-E').one().status, 'In Repair')
+        self.assertEqual(Equipment.query.count(), 3)
+
+    def test_bulk_import_command(self):
+        import os, tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'shipment.csv')
+            with open(path, 'w') as f:
+                f.write("name,type,serial_number\nSwitch 1,Switch,SW-1\nSwitch 2,Switch,SW-1\n")
+            runner = self.app.test_cli_runner()
+            result = runner.invoke(args=['inventory', 'import', path, '--dry-run'])
+            self.assertIn('Dry run: 1 rows with errors.', result.output)
+            self.assertEqual(Equipment.query.count(), 0)
+            result = runner.invoke(args=['inventory', 'import', path])
+            self.assertIn('Imported 1 items; 1 rows skipped.', result.output)
+            self.assertIn('Row 3: serial number SW-1 already appears on row 2', result.output)
+
+    def test_employee_cannot_list_equipment(self):
+        self.login_user(username="employee", password="password")
+        response = self.client.get(url_for('inventory.list_equipment'))
+        self.assertEqual(response.status_code, 403)
+
+
+if __name__ == '__main__':
+    unittest.main()
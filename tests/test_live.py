@@ -0,0 +1,90 @@
+import json
+import os
+import shutil
+import tempfile
+from flask import url_for
+from app.tickets.live import Hub, Subscriber, visible_to
+from tests.base import BaseTestCase
+
+
+class SubscriberTestCase(BaseTestCase):
+    def test_bounded_queue_drops_oldest(self):
+        subscriber = Subscriber(maxsize=3)
+        for i in range(5):
+            subscriber.put({'type': 'updated', 'ticket_id': i})
+        self.assertEqual(subscriber.take_dropped(), 2)
+        self.assertEqual([subscriber.get(0)['ticket_id'] for _ in range(3)], [2, 3, 4])
+        self.assertIsNone(subscriber.get(0))
+
+    def test_visibility_filter(self):
+        employee = Subscriber(10, visible_to(7, 'employee'))
+        staff = Subscriber(10, visible_to(1, 'it_support'))
+        for event in ({'ticket_id': 1, 'reporter_id': 7, 'assignee_id': None},
+                      {'ticket_id': 2, 'reporter_id': 8, 'assignee_id': None}):
+            employee.put(event)
+            staff.put(event)
+        self.assertEqual(len(employee.events), 1)
+        self.assertEqual(len(staff.events), 2)
+
+
+class LiveEventsTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.it_user = self.register_user(username="itsupport", email="it@test.com", role="it_support")
+        self.employee = self.register_user(username="employee", email="employee@test.com")
+
+    def test_ticket_changes_are_published_to_visible_subscribers(self):
+        hub = self.app.extensions['live_events']
+        staff = hub.subscribe(visible_to(self.it_user.id, 'it_support'))
+        other = hub.subscribe(visible_to(self.it_user.id + 100, 'employee'))
+        self.login_user(username="employee")
+        self.client.post(url_for('tickets.create_ticket'),
+                         data={'title': 'Monitor dead', 'description': 'No signal', 'priority': 'High', 'equipment_id': 0})
+
+        event = staff.get(0)
+        self.assertEqual((event['type'], event['title'], event['reporter_id']), ('created', 'Monitor dead', self.employee.id))
+        self.assertIsNone(other.get(0))
+
+        self.client.post(url_for('tickets.add_comment', ticket_id=event['ticket_id']), data={'body': 'Any update?'})
+        self.assertEqual(staff.get(0)['type'], 'commented')
+        hub.unsubscribe(staff)
+        hub.unsubscribe(other)
+
+
+class LiveEventBusTestCase(BaseTestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.app_config = {"LIVE_EVENTS_DB": os.path.join(self.tmpdir, 'events.db'), "LIVE_POLL_INTERVAL": 60}
+        super().setUp()
+        self.it_user = self.register_user(username="itsupport", email="it@test.com", role="it_support")
+
+    def tearDown(self):
+        self.app.extensions['live_events'].stop()
+        super().tearDown()
+        shutil.rmtree(self.tmpdir)
+
+    def test_bus_fans_out_across_hubs(self):
+        # Two hubs on the same file stand in for two worker processes
+        publisher = Hub(bus_path=self.app_config['LIVE_EVENTS_DB'])
+        consumer = Hub(bus_path=self.app_config['LIVE_EVENTS_DB'], poll_interval=60)
+        subscriber = consumer.subscribe()
+        publisher.publish({'type': 'created', 'ticket_id': 1})
+        publisher.publish({'type': 'updated', 'ticket_id': 1})
+        self.assertEqual(consumer.poll_once(), 2)
+        self.assertEqual([subscriber.get(0)['type'] for _ in range(2)], ['created', 'updated'])
+        consumer.stop()
+
+    def test_stream_replays_after_last_event_id(self):
+        hub = self.app.extensions['live_events']
+        hub.publish({'type': 'created', 'ticket_id': 1, 'reporter_id': self.it_user.id, 'assignee_id': None})
+        hub.publish({'type': 'updated', 'ticket_id': 1, 'reporter_id': self.it_user.id, 'assignee_id': None})
+        self.login_user(username="itsupport")
+
+        response = self.client.get(url_for('tickets.stream'), headers={'Last-Event-ID': '1'}, buffered=False)
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        chunks = iter(response.response)
+        self.assertEqual(next(chunks), b'retry: 3000\n\n')
+        message = next(chunks).decode('utf-8')
+        response.close()
+        self.assertIn('id: 2\nevent: updated\n', message)
+        self.assertEqual(json.loads(message.split('data: ', 1)[1])['ticket_id'], 1)
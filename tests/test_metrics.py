@@ -0,0 +1,43 @@
+from flask import url_for
+from app import db
+from app.metrics import registry
+from tests.base import BaseTestCase
+
+
+class MetricsTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        registry.reset()
+        self.app.config['METRICS_ENABLED'] = True
+
+    def tearDown(self):
+        registry.reset()
+        super().tearDown()
+
+    def test_metrics_disabled_by_default(self):
+        self.app.config['METRICS_ENABLED'] = False
+        response = self.client.get(url_for('metrics'))
+        self.assertEqual(response.status_code, 404)
+
+    def test_request_is_recorded(self):
+        self.register_user(username="metricsuser", email="metrics@example.com")
+        self.login_user(username="metricsuser")
+        self.client.get(url_for('tickets.list_tickets'))
+
+        response = self.client.get(url_for('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain'))
+        text = response.get_data(as_text=True)
+        self.assertIn('http_request_duration_seconds_count{endpoint="tickets.list_tickets"} 1', text)
+        self.assertIn('http_requests_total{endpoint="tickets.list_tickets",method="GET",status="200"} 1', text)
+        self.assertIn('http_request_sql_statements_count{endpoint="tickets.list_tickets"} 1', text)
+        self.assertIn('http_response_size_bytes_count{endpoint="tickets.list_tickets"} 1', text)
+        self.assertIn('template_render_duration_seconds_count{template="tickets/list_tickets.html"} 1', text)
+        self.assertIn('user_loader_cache_requests_total{result="hit"}', text)
+        self.assertNotIn('endpoint="metrics"', text)
+
+    def test_sql_statements_counted_per_request(self):
+        self.client.get(url_for('health_check'))
+        histogram = registry.request_queries['health_check']
+        self.assertEqual(histogram.count, 1)
+        self.assertEqual(histogram.sum, 0)
@@ -88,6 +88,28 @@ class TestModelCreation(BaseTestCase):
         # Fetch again to ensure state is current
         db.session.refresh(ticket)
         self.assertGreater(ticket.updated_at, initial_updated_at)
+    def test_load_user_is_cached_and_evicted_on_update(self):
+        from app.models import load_user, user_cache_stats
+        user = self.register_user(username='cached', email='cached@example.com', role='it_support')
+        user_id = user.id
+        db.session.expunge_all()
+
+        with self.assertMaxQueries(1):
+            self.assertEqual(load_user(str(user_id)).username, 'cached')
+        db.session.expunge_all()
+
+        hits = user_cache_stats()['hits']
+        with self.assertMaxQueries(0):
+            cached = load_user(str(user_id))
+        self.assertEqual(user_cache_stats()['hits'], hits + 1)
+        self.assertEqual(cached.role, 'it_support')
+        self.assertIs(db.session.get(User, user_id), cached) # Merged into the session, usable as normal
+
+        cached.role = 'employee'
+        db.session.commit()
+        db.session.expunge_all()
+        with self.assertMaxQueries(1): # Evicted, so reloaded with the new role
+            self.assertEqual(load_user(str(user_id)).role, 'employee')
 
 if __name__ == '__main__':
     unittest.main()
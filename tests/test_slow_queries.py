@@ -0,0 +1,46 @@
+import os
+import tempfile
+from sqlalchemy import inspect
+from app import db
+from app.models import Equipment, Ticket
+from app.slow_queries import advise_indexes, read_log
+from tests.base import BaseTestCase
+
+
+class SlowQueryLogTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        fd, self.log_path = tempfile.mkstemp(suffix='.jsonl')
+        os.close(fd)
+        self.app.config.update(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_LOG=self.log_path)
+
+    def tearDown(self):
+        self.app.config['SLOW_QUERY_THRESHOLD_MS'] = None
+        os.remove(self.log_path)
+        super().tearDown()
+
+    def test_slow_query_logged_with_plan_and_parameter_shape(self):
+        db.session.scalars(db.select(Equipment).where(Equipment.assigned_to_user_id == 42)).all()
+
+        entries = list(read_log(self.log_path))
+        entry = next(e for e in entries if 'FROM equipment' in e['statement'])
+        self.assertEqual(entry['parameters'], ['int'])
+        self.assertIsNone(entry['endpoint'])
+        self.assertIn('SCAN equipment', entry['plan'])
+
+    def test_advisor_suggests_index_for_full_scans_only(self):
+        db.session.scalars(db.select(Equipment).where(Equipment.assigned_to_user_id == 42)).all()
+        db.session.scalars(db.select(Ticket).where(Ticket.reporter_id == 1)).all() # Already indexed
+
+        suggestions = advise_indexes(read_log(self.log_path), inspect(db.engine))
+        self.assertEqual([(s.table, s.columns) for s in suggestions], [('equipment', ['assigned_to_user_id'])])
+
+    def test_advise_indexes_command(self):
+        db.session.scalars(db.select(Equipment).where(Equipment.assigned_to_user_id == 42)).all()
+        self.app.config['SLOW_QUERY_THRESHOLD_MS'] = None
+
+        result = self.app.test_cli_runner().invoke(args=['db', 'advise-indexes', '--log', self.log_path])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("equipment (assigned_to_user_id)", result.output)
+        self.assertIn("batch_op.create_index('ix_equipment_assigned_to_user_id', ['assigned_to_user_id'], unique=False)",
+                      result.output)
@@ -1,5 +1,5 @@
 from tests.base import BaseTestCase
-from app.models import User, Ticket, Equipment
+from app.models import User, Ticket, Equipment, Comment
 from app import db
 from flask import url_for
 
@@ -170,6 +170,341 @@ class TestTicketRoutes(BaseTestCase):
         # Check both comments are there
         self.assertIn(b'This is a comment from the employee.', response.data)
 
+    def test_list_tickets_keyset_pagination(self):
+        self.app.config['TICKETS_PER_PAGE'] = 2
+        for i in range(5):
+            self.create_test_ticket(user_id=self.employee_user.id, title=f'Paged Ticket {i}')
+
+        self.login_user(username="itsupport", password="password")
+        response = self.client.get(url_for('tickets.list_tickets'))
+        self.assertIn(b'Paged Ticket 4', response.data)
+        self.assertIn(b'Paged Ticket 3', response.data)
+        self.assertNotIn(b'Paged Ticket 2', response.data)
+        self.assertNotIn(b'Newer', response.data)
+
+        # Walk forward to the last page
+        seen = []
+        page_url = url_for('tickets.list_tickets')
+        while page_url:
+            response = self.client.get(page_url)
+            page = response.get_data(as_text=True)
+            seen.extend(sorted((i for i in range(5) if f'Paged Ticket {i}<' in page),
+                               key=lambda i: page.index(f'Paged Ticket {i}<')))
+            marker = page.find('?after=')
+            page_url = None
+            if marker != -1:
+                token = page[marker + len('?after='):page.index('"', marker)]
+                page_url = url_for('tickets.list_tickets', after=token)
+        self.assertEqual(seen, [4, 3, 2, 1, 0])
+        self.assertIn(b'Newer', response.data)
+
+        # And back again from the last page
+        marker = page.find('?before=')
+        token = page[marker + len('?before='):page.index('"', marker)]
+        response = self.client.get(url_for('tickets.list_tickets', before=token))
+        self.assertIn(b'Paged Ticket 2', response.data)
+        self.assertIn(b'Paged Ticket 1', response.data)
+        self.assertNotIn(b'Paged Ticket 0', response.data)
+
+    def test_list_tickets_ignores_malformed_cursor(self):
+        self.create_test_ticket(user_id=self.employee_user.id, title='Cursor Ticket')
+        self.login_user(username="itsupport", password="password")
+        response = self.client.get(url_for('tickets.list_tickets', after='not-a-cursor'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'Cursor Ticket', response.data)
+
+    def test_list_tickets_query_count_is_constant(self):
+        other_agent = self.register_user(username="agent2", email="agent2@test.com", role="it_support")
+        for i in range(10):
+            ticket = self.create_test_ticket(user_id=self.employee_user.id if i % 2 else self.it_user.id,
+                                             title=f'N+1 Ticket {i}')
+            ticket.assignee_id = other_agent.id if i % 3 else None
+        db.session.commit()
+
+        self.login_user(username="itsupport", password="password")
+        with self.assertMaxQueries(3): # user, page, facet counts
+            response = self.client.get(url_for('tickets.list_tickets'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'agent2', response.data)
+
+    def test_view_ticket_query_count_with_comments(self):
+        ticket = self.create_test_ticket(user_id=self.employee_user.id, title='Chatty Ticket')
+        for i in range(5):
+            db.session.add(Comment(body=f'comment {i}', user_id=self.it_user.id if i % 2 else self.employee_user.id,
+                                   ticket_id=ticket.id))
+        db.session.commit()
+
+        self.login_user(username="itsupport", password="password")
+        with self.assertMaxQueries(5):
+            response = self.client.get(url_for('tickets.view_ticket', ticket_id=ticket.id))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'comment 4', response.data)
+
+    def test_view_ticket_paginates_long_comment_threads(self):
+        import re
+        from datetime import datetime, timedelta, timezone
+        self.app.config['COMMENTS_PER_PAGE'] = 3
+        ticket = self.create_test_ticket(user_id=self.employee_user.id, title='Incident')
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        for i in range(7):
+            db.session.add(Comment(body=f'update {i:02d}', user_id=self.it_user.id, ticket_id=ticket.id,
+                                   created_at=start + timedelta(minutes=i)))
+        db.session.commit()
+
+        self.login_user(username="itsupport", password="password")
+        response = self.client.get(url_for('tickets.view_ticket', ticket_id=ticket.id))
+        self.assertIn(b'update 02', response.data)
+        self.assertNotIn(b'update 03', response.data)
+        self.assertIn(b'Load more comments', response.data)
+
+        # The fragment endpoint walks the rest of the thread in order
+        next_url = re.search(r'data-fragment-url="([^"]+)"', response.get_data(as_text=True)).group(1)
+        seen = []
+        while next_url:
+            with self.assertMaxQueries(3):
+                page = self.client.get(next_url.replace('&amp;', '&')).get_json()
+            seen += re.findall(r'update (\d\d)', page['html'])
+            next_url = page['next_url']
+        self.assertEqual(seen, ['03', '04', '05', '06'])
+
+    def test_ticket_comments_fragment_requires_permission(self):
+        ticket = self.create_test_ticket(user_id=self.it_user.id, title='Private')
+        self.register_user(username="outsider", email="outsider@test.com")
+        self.login_user(username="outsider")
+        response = self.client.get(url_for('tickets.ticket_comments', ticket_id=ticket.id))
+        self.assertEqual(response.status_code, 403)
+
+    def test_add_comment_to_long_thread_opens_page_with_new_comment(self):
+        from datetime import datetime, timezone
+        self.app.config['COMMENTS_PER_PAGE'] = 2
+        ticket = self.create_test_ticket(user_id=self.it_user.id, title='Busy')
+        for i in range(3):
+            db.session.add(Comment(body=f'old {i}', user_id=self.it_user.id, ticket_id=ticket.id,
+                                   created_at=datetime(2025, 1, 1, i, tzinfo=timezone.utc)))
+        db.session.commit()
+
+        self.login_user(username="itsupport", password="password")
+        response = self.client.post(url_for('tickets.add_comment', ticket_id=ticket.id),
+                                    data={'body': 'brand new'}, follow_redirects=True)
+        self.assertIn(b'brand new', response.data)
+        self.assertNotIn(b'old 0', response.data)
+        self.assertIn(b'Earlier comments', response.data)
+
+    def test_view_ticket_conditional_get(self):
+        ticket = self.create_test_ticket(user_id=self.employee_user.id, title='Cached Ticket')
+        self.login_user(username="itsupport", password="password")
+        url = url_for('tickets.view_ticket', ticket_id=ticket.id)
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+        self.assertIn('private', response.headers['Cache-Control'])
+
+        with self.assertMaxQueries(1):
+            response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+
+        # A new comment bumps updated_at; the redirect's flash message is rendered, not answered with a 304
+        response = self.client.post(url_for('tickets.add_comment', ticket_id=ticket.id), data={'body': 'On it'},
+                                    headers={'If-None-Match': etag}, follow_redirects=True)
+        self.assertIn(b'Comment added.', response.data)
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_view_ticket_etag_differs_per_viewer_role(self):
+        ticket = self.create_test_ticket(user_id=self.it_user.id, title='Shared Ticket')
+        self.login_user(username="itsupport", password="password")
+        etag = self.client.get(url_for('tickets.view_ticket', ticket_id=ticket.id)).headers['ETag']
+
+        self.it_user.role = 'admin'
+        db.session.commit()
+        response = self.client.get(url_for('tickets.view_ticket', ticket_id=ticket.id),
+                                   headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_search_matches_titles_and_comments(self):
+        printer = self.create_test_ticket(user_id=self.employee_user.id, title='Printer jammed on floor 3',
+                                          description='Paper stuck in tray two')
+        vpn = self.create_test_ticket(user_id=self.employee_user.id, title='Cannot connect',
+                                      description='Remote access is down')
+        db.session.add(Comment(body='Looks like the VPN certificate expired', user_id=self.it_user.id, ticket_id=vpn.id))
+        db.session.commit()
+
+        self.login_user(username="itsupport", password="password")
+        response = self.client.get(url_for('tickets.search', q='printer'))
+        self.assertIn(b'Printer jammed on floor 3', response.data)
+        self.assertNotIn(b'Cannot connect', response.data)
+
+        response = self.client.get(url_for('tickets.search', q='certificate'))
+        self.assertIn(b'Cannot connect', response.data)
+        self.assertIn(b'<mark>certificate</mark>', response.data)
+
+        # Edits are picked up incrementally, and FTS syntax in user input is harmless
+        printer.title = 'Scanner offline'
+        db.session.commit()
+        response = self.client.get(url_for('tickets.search', q='scanner"('))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'Scanner offline', response.data)
+
+    def test_search_only_shows_visible_tickets_to_employees(self):
+        self.create_test_ticket(user_id=self.it_user.id, title='Server room overheating')
+        staff = self.register_user(username="employee2", email="employee2@test.com", password="password")
+        self.create_test_ticket(user_id=staff.id, title='Server password reset')
+
+        self.login_user(username="employee2", password="password")
+        response = self.client.get(url_for('tickets.search', q='server'))
+        self.assertIn(b'Server password reset', response.data)
+        self.assertNotIn(b'Server room overheating', response.data)
+
+    def test_rebuild_search_index_command(self):
+        self.create_test_ticket(user_id=self.employee_user.id, title='Keyboard missing keys')
+        db.session.execute(db.text("DELETE FROM ticket_search"))
+        db.session.commit()
+
+        result = self.app.test_cli_runner().invoke(args=['tickets', 'rebuild-search-index'])
+        self.assertIn('Indexed 1 documents.', result.output)
+        self.login_user(username="itsupport", password="password")
+        response = self.client.get(url_for('tickets.search', q='keyboard'))
+        self.assertIn(b'Keyboard missing keys', response.data)
+
+    def test_list_tickets_filters_and_facet_counts(self):
+        urgent = self.create_test_ticket(user_id=self.employee_user.id, title='Urgent unassigned', priority='Urgent')
+        assigned = self.create_test_ticket(user_id=self.employee_user.id, title='Urgent assigned', priority='Urgent')
+        assigned.assignee_id = self.it_user.id
+        closed = self.create_test_ticket(user_id=self.employee_user.id, title='Urgent closed', priority='Urgent')
+        closed.status = 'Closed'
+        self.create_test_ticket(user_id=self.employee_user.id, title='Low unassigned', priority='Low')
+        db.session.commit()
+
+        self.login_user(username="itsupport", password="password")
+        response = self.client.get(url_for('tickets.list_tickets', status='Open', priority='Urgent', assignee_id='none'))
+        self.assertIn(b'Urgent unassigned', response.data)
+        self.assertNotIn(b'Urgent assigned', response.data)
+        self.assertNotIn(b'Urgent closed', response.data)
+        self.assertNotIn(b'Low unassigned', response.data)
+
+        from app.tickets.filters import TicketFilters, facet_counts
+        facets = facet_counts(TicketFilters(status='Open', priority='Urgent'))
+        # Each facet is counted under the other filters only
+        self.assertEqual(facets['status'], [('Open', 'Open', 2), ('Closed', 'Closed', 1)])
+        self.assertEqual(facets['priority'], [('Low', 'Low', 1), ('Urgent', 'Urgent', 2)])
+        self.assertEqual(facets['assignee_id'], [('none', 'Unassigned', 1), (str(self.it_user.id), 'itsupport', 1)])
+
+    def test_list_tickets_created_date_range_filter(self):
+        from datetime import datetime
+        old = self.create_test_ticket(user_id=self.employee_user.id, title='Old ticket')
+        old.created_at = datetime(2024, 1, 15, 12, 0)
+        new = self.create_test_ticket(user_id=self.employee_user.id, title='New ticket')
+        new.created_at = datetime(2024, 3, 1, 23, 30)
+        db.session.commit()
+
+        self.login_user(username="itsupport", password="password")
+        response = self.client.get(url_for('tickets.list_tickets', created_from='2024-02-01', created_to='2024-03-01'))
+        self.assertIn(b'New ticket', response.data)
+        self.assertNotIn(b'Old ticket', response.data)
+
+        response = self.client.get(url_for('tickets.list_tickets', created_from='garbage'))
+        self.assertIn(b'Old ticket', response.data)
+
+    def test_choice_lists_are_cached_until_equipment_changes(self):
+        ticket = self.create_test_ticket(user_id=self.employee_user.id, title='Cached dropdowns')
+        self.login_user(username="itsupport", password="password")
+        self.client.get(url_for('tickets.view_ticket', ticket_id=ticket.id))
+
+        with self.assertMaxQueries(3): # user, ticket, comments; dropdowns come from the cache
+            self.client.get(url_for('tickets.view_ticket', ticket_id=ticket.id))
+
+        db.session.add(Equipment(name='Docking Station', type='Other', serial_number='DS001'))
+        db.session.commit()
+        response = self.client.get(url_for('tickets.create_ticket'))
+        self.assertIn(b'Docking Station', response.data)
+
+    def test_large_choice_lists_render_as_lookup(self):
+        self.app.config['CHOICES_INLINE_LIMIT'] = 1
+        self.login_user(username="itsupport", password="password")
+        response = self.client.get(url_for('tickets.create_ticket'))
+        self.assertNotIn(b'<select id="equipment_id"', response.data)
+        self.assertIn(b'data-lookup-url="/tickets/lookup/equipment"', response.data)
+
+        response = self.client.get(url_for('tickets.lookup_equipment', q='Lap'))
+        self.assertEqual(response.get_json(), [{'id': self.equipment1.id, 'text': 'Laptop01 (S/N: SN001)'}])
+
+        # The hidden input still posts a plain id, validated against the cached choices
+        response = self.client.post(url_for('tickets.create_ticket'),
+                                    data=dict(title='Via lookup', description='...', priority='Low',
+                                              equipment_id=self.equipment1.id),
+                                    follow_redirects=True)
+        self.assertIn(b'Ticket created successfully!', response.data)
+
+    def test_import_command_streams_batches_and_resumes(self):
+        import json, os, tempfile
+        records = [
+            {'title': 'Old VPN issue', 'description': 'Tunnel drops', 'status': 'Closed', 'priority': 'High',
+             'reporter': 'emp', 'assignee': 'itsupport', 'created_at': '2021-03-04T10:00:00Z',
+             'resolved_at': '2021-03-05T09:00:00+00:00',
+             'comments': [{'author': 'itsupport', 'body': 'Rebooted the concentrator'}]},
+            {'title': 'Ghost user', 'description': '...', 'reporter': 'nobody'},
+            {'title': 'Old printer issue', 'description': 'Toner', 'reporter': 'emp'},
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'history.jsonl')
+            with open(path, 'w') as f:
+                f.write('\n'.join(json.dumps(r) for r in records))
+
+            runner = self.app.test_cli_runner()
+            result = runner.invoke(args=['tickets', 'import', path, '--batch-size', '1'])
+            self.assertIn('Imported 2 tickets and 1 comments; skipped 1 records.', result.output)
+            self.assertIn("Record 2: skipped, unknown reporter 'nobody'", result.output)
+            self.assertFalse(os.path.exists(path + '.checkpoint'))
+
+            vpn = Ticket.query.filter_by(title='Old VPN issue').one()
+            self.assertEqual(vpn.assignee_id, self.it_user.id)
+            self.assertEqual(vpn.created_at.year, 2021)
+            self.assertEqual(vpn.comments.one().body, 'Rebooted the concentrator')
+
+            # A crash after the first two records leaves a checkpoint; the re-run skips them
+            db.session.execute(db.delete(Ticket).where(Ticket.title == 'Old printer issue'))
+            db.session.commit()
+            with open(path + '.checkpoint', 'w') as f:
+                json.dump({'source': os.path.abspath(path), 'records': 2}, f)
+            result = runner.invoke(args=['tickets', 'import', path])
+            self.assertIn('Resumed after record 2.', result.output)
+            self.assertIn('Imported 1 tickets and 0 comments; skipped 0 records.', result.output)
+            self.assertEqual(Ticket.query.filter_by(title='Old VPN issue').count(), 1)
+            self.assertEqual(Ticket.query.filter_by(title='Old printer issue').count(), 1)
+
+    def test_export_streams_filtered_rows(self):
+        import csv, gzip, io, json
+        urgent = self.create_test_ticket(user_id=self.employee_user.id, title='Exported, urgent', priority='Urgent')
+        self.create_test_ticket(user_id=self.employee_user.id, title='Not exported', priority='Low')
+        db.session.add(Comment(body='On it', user_id=self.it_user.id, ticket_id=urgent.id))
+        db.session.commit()
+
+        self.login_user(username="itsupport", password="password")
+        response = self.client.get(url_for('tickets.export_tickets', format='csv', priority='Urgent'))
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.mimetype, 'text/csv')
+        rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+        self.assertEqual([r['title'] for r in rows], ['Exported, urgent'])
+        self.assertEqual(rows[0]['reporter'], 'emp')
+
+        response = self.client.get(url_for('tickets.export_tickets', format='jsonl', dataset='comments',
+                                           priority='Urgent', gzip='1'))
+        self.assertIn('comments.jsonl.gz', response.headers['Content-Disposition'])
+        lines = gzip.decompress(response.data).decode('utf-8').splitlines()
+        self.assertEqual(json.loads(lines[0])['author'], 'itsupport')
+
+        result = self.app.test_cli_runner().invoke(args=['tickets', 'export', '--format', 'jsonl', '--priority', 'Low'])
+        self.assertEqual([json.loads(l)['title'] for l in result.output.splitlines()], ['Not exported'])
+
+    def test_export_requires_it_support(self):
+        self.register_user(username="employee2", email="employee2@test.com")
+        self.login_user(username="employee2", password="password")
+        response = self.client.get(url_for('tickets.export_tickets'))
+        self.assertEqual(response.status_code, 403)
+
 
 if __name__ == '__main__':
     unittest.main()